@@ -0,0 +1,166 @@
+"""
+Shared background refreshing of upstream data for the homework apps.
+
+A feed such as the Bitcoin rates or the astronauts is loaded on first use,
+kept in memory and replaced every few seconds by a daemon thread, so requests
+read it without waiting for the upstream.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+
+FIRST_RETRY_DELAY = 1.0
+
+# The outcome of a first load whose caller was interrupted before it finished.
+_INTERRUPTED = object()
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Keeps the value returned by `load` in memory, refreshed in the background.
+
+    The first read loads the value and starts a daemon thread that loads it
+    again every `interval` seconds. When a refresh fails, the previous value
+    keeps being served, the error is kept in `last_error` and logged. The
+    value is replaced with one assignment, so readers never see a half-built
+    one.
+
+    The first load runs once however many threads ask for the value at the
+    same time: the others wait for its result without holding a lock. If that
+    load is interrupted, one of the waiting readers starts it again. While
+    nothing is loaded yet, a failed first load is not retried by every read:
+    reads re-raise its error until a delay has passed, which starts at
+    `FIRST_RETRY_DELAY` seconds and doubles after every failure, up to
+    `interval`.
+
+    Attributes:
+        name (str): The name of the feed in messages and in the name of the thread.
+        interval (float): The number of seconds between refreshes.
+        last_refresh (float): The time.time() of the last successful refresh, or None.
+        last_error (Exception): The error of the last failed refresh, or None after a success.
+    """
+
+    def __init__(self, name, load, interval=60):
+        """
+        Args:
+            name (str): The name of the feed.
+            load (callable): Fetches the upstream and returns the new value, raising on failure.
+            interval (float): The number of seconds between refreshes.
+        """
+        self.name = name
+        self.interval = interval
+        self.last_refresh = None
+        self.last_error = None
+        self._load = load
+        self._value = None
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._loading = None
+        self._failed_loads = 0
+        self._retry_at = 0.0
+
+    def refresh(self):
+        """Load the value and swap it in. Raises the load error and keeps the old value on failure."""
+        try:
+            value = self._load()
+        except Exception as e:
+            self.last_error = e
+            raise
+        self._swap(value)
+
+    def _swap(self, value):
+        self._value = value
+        self.last_refresh = time.time()
+        self.last_error = None
+        self._failed_loads = 0
+
+    def _check_retry(self):
+        """Re-raise the error of the failed first load while its retry delay has not passed."""
+        if self.last_error is not None and time.monotonic() < self._retry_at:
+            raise self.last_error
+
+    def _back_off(self):
+        """Delay the next first load attempt after a failure."""
+        delay = min(FIRST_RETRY_DELAY * 2 ** self._failed_loads, self.interval)
+        self._failed_loads += 1
+        self._retry_at = time.monotonic() + delay
+        logger.warning('Failed to load %s, retrying in %.1f s: %s', self.name, delay, self.last_error)
+
+    def ensure_started(self):
+        """Load the value on first use and start the background refresh. Raises the load error if nothing is loaded yet."""
+        while self._thread is None:
+            loading, leader = self._begin_load()
+            if loading is None:
+                return
+            if not leader:
+                loading.result()
+                continue
+            outcome = _INTERRUPTED
+            try:
+                self.refresh()
+                outcome = None
+            except Exception as e:
+                outcome = e
+                raise
+            finally:
+                self._end_load(loading, outcome)
+
+    def _begin_load(self):
+        """
+        Return the future of the first load and whether the caller has to run it, or (None, False) if it is done.
+
+        Raises the error of the last failed first load while its retry delay has not passed.
+        """
+        with self._start_lock:
+            if self._thread is not None:
+                return None, False
+            if self._loading is not None:
+                return self._loading, False
+            if self.last_refresh is not None:
+                self._start_thread()
+                return None, False
+            self._check_retry()
+            self._loading = Future()
+            # A running future cannot be cancelled, so it always resolves for the readers waiting on it.
+            self._loading.set_running_or_notify_cancel()
+            return self._loading, True
+
+    def _end_load(self, loading, outcome):
+        """
+        Finish the first load started by `_begin_load`, waking up the readers waiting for it.
+
+        `outcome` is None after a success, the error of a failed load, which
+        the readers raise, or `_INTERRUPTED`, after which they try again.
+        """
+        with self._start_lock:
+            self._loading = None
+            if outcome is None:
+                self._start_thread()
+            elif outcome is not _INTERRUPTED:
+                self._back_off()
+        if isinstance(outcome, BaseException):
+            loading.set_exception(outcome)
+        else:
+            loading.set_result(None)
+
+    def _start_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_forever, name=f'{self.name}-refresh', daemon=True)
+            self._thread.start()
+
+    def get(self):
+        """Return the last loaded value, loading it first if this is the first read."""
+        self.ensure_started()
+        return self._value
+
+    def _refresh_forever(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning('Failed to refresh %s, serving data from %s: %s', self.name, self.last_refresh, e)
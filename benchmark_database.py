@@ -0,0 +1,44 @@
+"""
+Compare queries per second of the pooled Database against a new connection per query.
+
+Run from the repository root: `python benchmark_database.py`.
+"""
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import Database
+
+
+DATABASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hw_4_sql', 'chinook.db')
+QUERY = "SELECT SUM(Total) FROM invoices WHERE BillingCountry = ?"
+REQUESTS = 5000
+THREADS = 8
+
+
+def connect_per_call(query, args=()):
+    """The old execute_query: connect, execute, commit and close on every call."""
+    with sqlite3.connect(DATABASE_PATH) as connection:
+        cursor = connection.cursor()
+        cursor.execute(query, args)
+        connection.commit()
+        records = cursor.fetchall()
+    connection.close()
+    return records
+
+
+def measure(execute, threads):
+    """Return the queries per second of `execute` spread over `threads` threads."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: execute(QUERY, ('USA',)), range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    database = Database(DATABASE_PATH)
+    print(f'{"threads":>7} | {"connect per call":>16} | {"pooled":>10}')
+    for threads in (1, THREADS):
+        print(f'{threads:>7} | {measure(connect_per_call, threads):>16.0f} | {measure(database.execute, threads):>10.0f}')
+    database.close()
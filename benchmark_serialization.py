@@ -0,0 +1,110 @@
+"""
+Compare responses per second of the old and new JSON paths of /order-price/sales-info and /customers.
+
+The old path fetches tuples, builds dicts by hand, or not at all for
+/customers, and encodes them with the standard library like `jsonify` did.
+The new path fetches dict rows with `Database.execute_dicts` and encodes them
+with `serialization.dumps`, which uses orjson when it is installed.
+
+Run from the repository root: `python benchmark_serialization.py`.
+"""
+import json
+import os
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+import serialization
+from database import Database
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SALES_DATABASE_PATH = os.path.join(ROOT, 'hw_4_sql', 'chinook.db')
+CUSTOMERS_DATABASE_PATH = os.path.join(ROOT, 'hw_3_flask_views', 'chinook.db')
+REQUESTS = 200
+
+SALES_INFO_QUERY = """
+    SELECT
+        invoices.InvoiceId AS invoice_id,
+        invoices.BillingCountry AS billing_country,
+        invoice_items.TrackId AS track_id,
+        invoice_items.UnitPrice AS unit_price,
+        invoice_items.Quantity AS quantity
+    FROM invoices
+    INNER JOIN invoice_items ON invoices.InvoiceId = invoice_items.InvoiceId
+    WHERE invoices.InvoiceId IN (
+        SELECT InvoiceId FROM invoices WHERE InvoiceId > ? ORDER BY InvoiceId LIMIT ?
+    )
+    ORDER BY invoices.InvoiceId, invoice_items.InvoiceLineId;
+"""
+CUSTOMERS_QUERY = "SELECT * FROM customers"
+
+
+def stdlib_dumps(obj):
+    """Encode like the default Flask JSON provider."""
+    return json.dumps(obj, default=DefaultJSONProvider.default, sort_keys=True, separators=(',', ':')).encode()
+
+
+def old_sales_info(database):
+    rows = database.execute(SALES_INFO_QUERY, (0, 1000))
+    sales_info = [
+        {'invoice_id': row[0], 'billing_country': row[1], 'track_id': row[2], 'unit_price': row[3], 'quantity': row[4]}
+        for row in rows
+    ]
+    return stdlib_dumps({'sales_info': sales_info, 'next_after_invoice_id': None})
+
+
+def new_sales_info(database):
+    sales_info = database.execute_dicts(SALES_INFO_QUERY, (0, 1000))
+    return serialization.dumps({'sales_info': sales_info, 'next_after_invoice_id': None}, sort_keys=True)
+
+
+def old_customers(database):
+    return stdlib_dumps(database.execute(CUSTOMERS_QUERY))
+
+
+def new_customers(database):
+    return b''.join(serialization.iter_json_array(database.stream(CUSTOMERS_QUERY, as_dicts=True)))
+
+
+def measure_encoding(database, query, args):
+    """Return the encodings per second of already fetched rows: tuples with stdlib json, dicts with `dumps`."""
+    tuples = database.execute(query, args)
+    dicts = database.execute_dicts(query, args)
+    rates = []
+    for encode, rows in ((stdlib_dumps, tuples), (serialization.dumps, dicts)):
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            encode(rows)
+        rates.append(REQUESTS / (time.perf_counter() - start))
+    return rates
+
+
+def measure(build, database):
+    """Return the responses per second of `build` and the size of one response."""
+    body = build(database)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        build(database)
+    return REQUESTS / (time.perf_counter() - start), len(body)
+
+
+if __name__ == '__main__':
+    print(f'encoder: {"orjson" if serialization.ORJSON_AVAILABLE else "json (orjson is not installed)"}')
+    print(
+        f'{"endpoint":<24} | {"old req/s":>9} | {"new req/s":>9} | {"speedup":>7} | {"bytes":>7}'
+        f' | {"encode old/s":>12} | {"encode new/s":>12}'
+    )
+    for name, path, old, new, query, args in (
+        ('/order-price/sales-info', SALES_DATABASE_PATH, old_sales_info, new_sales_info, SALES_INFO_QUERY, (0, 1000)),
+        ('/customers', CUSTOMERS_DATABASE_PATH, old_customers, new_customers, CUSTOMERS_QUERY, ()),
+    ):
+        database = Database(path)
+        old_rate, _ = measure(old, database)
+        new_rate, size = measure(new, database)
+        encode_old, encode_new = measure_encoding(database, query, args)
+        print(
+            f'{name:<24} | {old_rate:>9.0f} | {new_rate:>9.0f} | {new_rate / old_rate:>6.1f}x | {size:>7}'
+            f' | {encode_old:>12.0f} | {encode_new:>12.0f}'
+        )
+        database.close()
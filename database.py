@@ -0,0 +1,231 @@
+"""
+Shared SQLite access for the homework apps.
+
+Connections are opened once, tuned with pragmas and reused between requests
+instead of being opened and closed around every query. Read queries go to
+connections opened in read-only URI mode and are never committed.
+
+Opening a database never changes the file. Settings stored in the file, such
+as the WAL journal mode, are applied by the `migrate.py` of each app.
+"""
+import os
+import queue
+import re
+import sqlite3
+from contextlib import contextmanager
+
+
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 64 * 1024
+CACHED_STATEMENTS = 256
+POOL_SIZE = 16
+
+READ_STATEMENTS = ('SELECT', 'EXPLAIN', 'VALUES')
+
+# String literals, quoted identifiers and comments, which may contain any word.
+_LITERALS_AND_COMMENTS = re.compile(
+    r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|--[^\n]*|/\*.*?(?:\*/|$)""", re.S
+)
+_WRITE_KEYWORDS = re.compile(
+    r'\b(?:INSERT|UPDATE|DELETE|REPLACE|UPSERT|CREATE|DROP|ALTER|ATTACH|DETACH|VACUUM|REINDEX|PRAGMA)\b', re.I
+)
+
+
+def column_names(cursor):
+    """Return the names of the result columns of `cursor`, as given by the query or its aliases."""
+    return [column[0] for column in cursor.description]
+
+
+def is_read_query(query):
+    """
+    Return True if `query` only reads, judging by its first keyword after comments.
+
+    A query starting with WITH counts as a read only if no keyword that writes
+    appears anywhere outside its literals, since a common table expression can
+    precede INSERT, UPDATE or DELETE. Doubtful queries, such as a read calling
+    replace(), count as writes, which only costs them the read-only pool.
+    """
+    text = _LITERALS_AND_COMMENTS.sub(' ', query)
+    words = text.split(None, 1)
+    if not words:
+        return False
+    keyword = words[0].upper()
+    if keyword == 'WITH':
+        return _WRITE_KEYWORDS.search(text) is None
+    return keyword in READ_STATEMENTS
+
+
+class ConnectionPool:
+    """
+    A pool of SQLite connections to one database file.
+
+    Connections are handed to one thread at a time and returned to the pool
+    afterwards, so their page cache, memory map and statement cache survive
+    between requests. Connections beyond `size` are closed when released.
+
+    Attributes:
+        path (str): The path to the database file.
+        read_only (bool): Whether connections are opened with `mode=ro`.
+    """
+
+    def __init__(self, path, read_only=False, size=POOL_SIZE, cached_statements=CACHED_STATEMENTS):
+        self.path = path
+        self.read_only = read_only
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the block."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            yield connection
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _connect(self):
+        if self.read_only:
+            uri = f'file:{self.path}?mode=ro'
+            connection = sqlite3.connect(
+                uri, uri=True, check_same_thread=False, cached_statements=self.cached_statements
+            )
+        else:
+            connection = sqlite3.connect(
+                self.path, check_same_thread=False, cached_statements=self.cached_statements
+            )
+            if connection.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal':
+                # Safe in WAL mode, where a crash can lose the last commits but not corrupt the file.
+                connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        connection.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KIB}')
+        connection.execute('PRAGMA temp_store=MEMORY')
+        return connection
+
+
+class Database:
+    """
+    Read-only and read-write connection pools for one SQLite database.
+
+    Attributes:
+        path (str): The absolute path to the database file.
+        readers (ConnectionPool): The pool used for SELECT queries.
+        writers (ConnectionPool): The pool used for every other statement.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.writers = ConnectionPool(self.path)
+        self.readers = ConnectionPool(self.path, read_only=True)
+        with self.writers.connection():
+            pass
+
+    def execute(self, query, args=()):
+        """
+        Run `query` with `args` and return all resulting rows.
+
+        Reads run on a read-only connection without a commit, writes are
+        committed before the connection goes back to the pool.
+        """
+        return self._execute(query, args, as_dicts=False)
+
+    def execute_dicts(self, query, args=()):
+        """
+        Run `query` with `args` and return all resulting rows as dicts keyed by column name.
+
+        Rows are fetched as tuples and zipped with the column names read once
+        from the cursor, which is cheaper than a per-row row factory.
+        """
+        return self._execute(query, args, as_dicts=True)
+
+    def _execute(self, query, args, as_dicts):
+        read_only = is_read_query(query)
+        pool = self.readers if read_only else self.writers
+        with pool.connection() as connection:
+            cursor = connection.execute(query, args)
+            try:
+                records = cursor.fetchall()
+                if as_dicts and cursor.description:
+                    names = column_names(cursor)
+                    records = [dict(zip(names, record)) for record in records]
+            finally:
+                cursor.close()
+            if not read_only:
+                connection.commit()
+        return records
+
+    def execute_script(self, script):
+        """Run several SQL statements on a read-write connection, for schema setup."""
+        with self.writers.connection() as connection:
+            connection.executescript(script)
+
+    def enable_wal(self):
+        """
+        Switch the database file to write-ahead logging, for migrations.
+
+        The mode is stored in the file, so readers no longer block the writer
+        and the writer no longer blocks readers. Idle connections are closed,
+        so that the next ones are opened with the settings for WAL mode.
+        """
+        with self.writers.connection() as connection:
+            mode = connection.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+        if mode.lower() != 'wal':
+            raise sqlite3.OperationalError(f'Could not switch {self.path} to WAL mode, it stays in {mode} mode.')
+        self.writers.close()
+        self.readers.close()
+
+    def stream(self, query, args=(), chunk_size=1000, as_dicts=False):
+        """
+        Yield the rows of a read query, fetching `chunk_size` rows at a time.
+
+        The connection stays borrowed until the generator is exhausted or closed,
+        so memory is bounded by one chunk however many rows the query returns.
+        With `as_dicts`, rows are dicts keyed by column name, as in `execute_dicts`.
+        """
+        with self.readers.connection() as connection:
+            cursor = connection.execute(query, args)
+            names = column_names(cursor) if as_dicts else None
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    if names:
+                        yield from (dict(zip(names, row)) for row in rows)
+                    else:
+                        yield from rows
+            finally:
+                cursor.close()
+
+    def close(self):
+        self.readers.close()
+        self.writers.close()
+
+
+_databases = {}
+
+
+def get_database(path):
+    """Return the shared Database for `path`, creating it on first use."""
+    path = os.path.abspath(path)
+    database = _databases.get(path)
+    if database is None:
+        database = _databases.setdefault(path, Database(path))
+    return database
@@ -0,0 +1,22 @@
+"""
+Production launcher settings for the homework Flask apps.
+
+Run an app from its folder with the repository root on PYTHONPATH, for example:
+    cd hw_3_flask_views && PYTHONPATH=.. gunicorn -c ../gunicorn.conf.py main:app
+
+Every worker process serves requests on a pool of threads, so a request
+waiting on a slow upstream holds one thread instead of the whole server.
+The views are sync: the upstream feeds are refreshed in the background, so
+requests read them from memory.
+"""
+import multiprocessing
+import os
+
+
+bind = os.environ.get('BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('THREADS', 16))
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
@@ -0,0 +1,186 @@
+"""
+Shared HTTP client for the homework apps.
+
+One pooled httpx client per process replaces the per-call `requests.get` and
+`httpx.get`, so connections stay open between requests instead of paying for
+TCP and TLS setup every time. Run the apps with the repository root on
+PYTHONPATH, for example `PYTHONPATH=.. python main.py` from a homework folder.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from http import HTTPStatus
+
+import httpx
+
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.2
+
+RETRY_STATUSES = frozenset({
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+})
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClient:
+    """
+    A pooled HTTP client with timeouts and retries, usable from sync and async code.
+
+    Redirects are followed, as `requests.get` did. The sync client is created
+    on first use, and again in a forked child, and shared by every thread. The
+    async client behind `fetch_many` lives on an event loop that the client
+    runs in a daemon thread. Coroutines on any other loop, such as the new
+    `asyncio.run` of every `fetch_many` call, hand their requests to that
+    loop, so they all share one async connection pool.
+
+    Attributes:
+        timeout (httpx.Timeout): The connect, read, write and pool timeouts.
+        retries (int): How many times a failed request is repeated.
+        backoff (float): The base delay between retries in seconds, doubled on every attempt.
+        http2 (bool): Whether to negotiate HTTP/2. Needs the `h2` package.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, http2=False):
+        if http2 and not HTTP2_AVAILABLE:
+            raise ValueError('HTTP/2 needs the "h2" package: pip install httpx[http2].')
+        self.timeout = timeout
+        self.limits = limits
+        self.retries = retries
+        self.backoff = backoff
+        self.http2 = http2
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+        self._async_client = None
+        self._async_loop = None
+        self._loop = None
+        self._loop_pid = None
+
+    def get(self, url, **kwargs):
+        """Send a GET request, retrying transport errors and retryable statuses, and return the last response."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._sync_client().get(url, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            time.sleep(self._delay(attempt))
+
+    async def aget(self, url, **kwargs):
+        """Async version of `get` that shares the async connection pool."""
+        return await self._on_client_loop(self._aget(url, **kwargs))
+
+    async def _aget(self, url, **kwargs):
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._async_client_for_loop().get(url, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            await asyncio.sleep(self._delay(attempt))
+
+    async def afetch_many(self, urls, concurrency=10, **kwargs):
+        """
+        GET every URL concurrently, at most `concurrency` at a time.
+
+        Returns the responses in the order of `urls`. A request that still fails
+        after its retries is returned as the exception instead of a response.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.aget(url, **kwargs)
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+    def fetch_many(self, urls, concurrency=10, **kwargs):
+        """Run `afetch_many` from sync code. Must not be called from a running event loop."""
+        return asyncio.run(self.afetch_many(urls, concurrency=concurrency, **kwargs))
+
+    def close(self):
+        """Close the sync connection pool."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Close the async connection pool."""
+        if self._async_client is not None:
+            await self._on_client_loop(self._async_client.aclose())
+            self._async_client = None
+            self._async_loop = None
+
+    def _client_options(self):
+        return {'timeout': self.timeout, 'limits': self.limits, 'http2': self.http2, 'follow_redirects': True}
+
+    def _sync_client(self):
+        """Return the sync client, creating it on first use and after a fork, whose child must not share its sockets."""
+        if self._client is None or self._client_pid != os.getpid():
+            with self._client_lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    self._client = httpx.Client(**self._client_options())
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def _client_loop(self):
+        """Return the event loop of the async client, starting it in a daemon thread on first use and after a fork."""
+        if self._loop is None or self._loop_pid != os.getpid():
+            with self._client_lock:
+                if self._loop is None or self._loop_pid != os.getpid():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name='http-client-loop', daemon=True).start()
+                    self._async_client = None
+                    self._loop, self._loop_pid = loop, os.getpid()
+        return self._loop
+
+    async def _on_client_loop(self, coroutine):
+        """Await `coroutine` on the event loop of the async client, from whichever loop the caller runs on."""
+        loop = self._client_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coroutine
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, loop))
+
+    def _async_client_for_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(**self._client_options())
+            self._async_loop = loop
+        return self._async_client
+
+    def _delay(self, attempt):
+        """Return the exponential backoff for `attempt` with jitter, so retrying callers do not line up."""
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+client = HttpClient()
+
+
+def get(url, **kwargs):
+    """Send a GET request through the shared client."""
+    return client.get(url, **kwargs)
+
+
+def fetch_many(urls, concurrency=10, **kwargs):
+    """GET every URL concurrently through the shared client."""
+    return client.fetch_many(urls, concurrency=concurrency, **kwargs)
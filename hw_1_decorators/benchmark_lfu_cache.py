@@ -0,0 +1,34 @@
+import time
+
+from lfu_cache import lfu_cache
+
+
+SIZES = [100, 1_000, 10_000, 100_000]
+MISSES = 20_000
+
+
+def measure_miss_latency(max_size, misses=MISSES):
+    """
+    Fill a cache of `max_size` entries and return the average latency of a miss in microseconds.
+
+    Every measured call uses a new key, so each one pays for a lookup, a call and an eviction.
+    """
+    @lfu_cache(max_size=max_size)
+    def identity(value):
+        return value
+
+    for value in range(max_size):
+        identity(value)
+
+    start = time.perf_counter()
+    for value in range(max_size, max_size + misses):
+        identity(value)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / misses * 1_000_000
+
+
+if __name__ == '__main__':
+    print(f'{"max_size":>10} | {"miss latency, us":>16}')
+    for size in SIZES:
+        print(f'{size:>10} | {measure_miss_latency(size):>16.2f}')
@@ -0,0 +1,453 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+
+CacheInfo = namedtuple(
+    'CacheInfo',
+    ['hits', 'misses', 'maxsize', 'currsize', 'evictions', 'expirations', 'currbytes', 'maxbytes']
+)
+
+MISSING = object()
+
+
+def default_sizer(value):
+    """Return the size of a cached value in bytes: its length for bytes and strings, sys.getsizeof otherwise."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+def stable_key_hash(key):
+    """
+    Return a hex digest of `key` that is the same in every process and interpreter run.
+
+    The key is encoded from its structure rather than from `repr` or `hash`, so
+    string hash randomization and custom `__repr__` methods do not change it.
+    Supported values are None, bools, numbers, strings, bytes, and tuples, lists,
+    dicts, sets and frozensets built from them.
+
+    Raises:
+        TypeError: If the key contains a value of another type.
+    """
+    return hashlib.blake2b(_encode_key(key), digest_size=20).hexdigest()
+
+
+def _encode_key(value):
+    if value is None:
+        return b'N'
+    if isinstance(value, bool):
+        return b'B1' if value else b'B0'
+    if isinstance(value, int):
+        return b'I%d;' % value
+    if isinstance(value, float):
+        return b'F' + value.hex().encode() + b';'
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+        return b'S%d:' % len(value) + value
+    if isinstance(value, (bytes, bytearray)):
+        return b'Y%d:' % len(value) + bytes(value)
+    if isinstance(value, (tuple, list)):
+        tag = b'T' if isinstance(value, tuple) else b'L'
+        return tag + b'%d:' % len(value) + b''.join(_encode_key(item) for item in value)
+    if isinstance(value, dict):
+        items = sorted(_encode_key(key) + _encode_key(item) for key, item in value.items())
+        return b'D%d:' % len(items) + b''.join(items)
+    if isinstance(value, (set, frozenset)):
+        items = sorted(_encode_key(item) for item in value)
+        return b'E%d:' % len(items) + b''.join(items)
+    raise TypeError(f'Cannot build a stable cache key from {type(value).__name__}.')
+
+
+class CacheStore:
+    """
+    Interface of the stores behind lfu_cache.
+
+    A store keeps results by key, decides what to evict, and counts hits,
+    misses, evictions and expirations for `info()`.
+    """
+
+    def get(self, key, default=MISSING):
+        """Return the value for `key`, or `default` on a miss."""
+        raise NotImplementedError
+
+    def put(self, key, value):
+        """Store `value` under `key`."""
+        raise NotImplementedError
+
+    def expire(self):
+        """Drop every entry whose TTL has run out and return how many were dropped."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry and reset the statistics."""
+        raise NotImplementedError
+
+    def info(self):
+        """Return the store statistics as a CacheInfo tuple."""
+        raise NotImplementedError
+
+
+class _PriorityNode:
+    """
+    A bucket of the priority list.
+
+    Holds every key whose priority is exactly `priority`. Keys are kept
+    in an OrderedDict so the least recently used one is always first.
+    """
+    __slots__ = ('priority', 'keys', 'prev', 'next')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.keys = OrderedDict()
+        self.prev = self
+        self.next = self
+
+    def insert_after(self, node):
+        """Link `node` right after this one and return it."""
+        node.prev = self
+        node.next = self.next
+        self.next.prev = node
+        self.next = node
+        return node
+
+    def unlink(self):
+        """Remove this node from the list."""
+        self.prev.next = self.next
+        self.next.prev = self.prev
+
+
+class _Entry:
+    __slots__ = ('value', 'node', 'size', 'expires_at')
+
+    def __init__(self, value, node, size, expires_at):
+        self.value = value
+        self.node = node
+        self.size = size
+        self.expires_at = expires_at
+
+
+class LFUStore(CacheStore):
+    """
+    Least frequently used store with O(1) lookup, insertion and eviction.
+
+    Entries live in a dict, and every key is referenced from the bucket of its
+    priority. Buckets form a doubly linked list sorted by priority, so the
+    eviction victim is always the least recently used key of the first bucket.
+
+    A hit raises the priority of an entry by one. A new entry starts at the
+    priority of the last evicted one plus one, so the floor rises with every
+    eviction and entries that were hot long ago lose their lead over fresh ones
+    instead of staying pinned forever.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept in the store.
+        max_bytes (int): The maximum total size of the values, or None for no limit.
+        ttl (float): The number of seconds an entry lives, or None to keep it until evicted.
+        hits (int): The number of successful lookups.
+        misses (int): The number of failed lookups.
+        evictions (int): The number of entries dropped to make room for new ones.
+        expirations (int): The number of entries dropped because their TTL ran out.
+        current_bytes (int): The total size of the stored values.
+    """
+
+    def __init__(self, max_size, max_bytes=None, sizer=default_sizer, ttl=None):
+        if max_size <= 0:
+            raise ValueError('max_size must be a positive number.')
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError('max_bytes must be a positive number.')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be a positive number.')
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.ttl = ttl
+        self.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=MISSING):
+        """Return the value for `key` and bump its priority, or `default` on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        entry.node = self._promote(key, entry.node)
+        return entry.value
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`, evicting the lowest priority entries until it fits.
+
+        A value larger than `max_bytes` on its own is not stored at all.
+        """
+        if key in self._entries:
+            self._remove(key)
+        size = self.sizer(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        while len(self._entries) >= self.max_size or (
+                self.max_bytes is not None and self.current_bytes + size > self.max_bytes):
+            self._evict()
+        node = self._bucket_after(self._head, self._age + 1)
+        node.keys[key] = None
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = _Entry(value, node, size, expires_at)
+        self.current_bytes += size
+        if expires_at is not None:
+            self._expiry_order[key] = None
+
+    def expire(self):
+        """Drop every entry whose TTL has run out and return how many were dropped."""
+        now = time.monotonic()
+        expired = 0
+        while self._expiry_order:
+            key = next(iter(self._expiry_order))
+            if self._entries[key].expires_at > now:
+                break
+            self._remove(key)
+            expired += 1
+        self.expirations += expired
+        return expired
+
+    def clear(self):
+        """Remove every entry and reset the statistics."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.current_bytes = 0
+        self._age = 0
+        self._entries = {}
+        self._expiry_order = OrderedDict()
+        self._head = _PriorityNode(0)
+
+    def info(self):
+        """Return the store statistics as a CacheInfo tuple."""
+        return CacheInfo(
+            self.hits, self.misses, self.max_size, len(self._entries),
+            self.evictions, self.expirations, self.current_bytes, self.max_bytes
+        )
+
+    def _bucket_after(self, node, priority):
+        """
+        Return the bucket of `priority`, searching forward from `node` and creating it if needed.
+
+        Every stored priority is at least the current age, so callers only ever
+        step over one or two buckets.
+        """
+        while node.next is not self._head and node.next.priority < priority:
+            node = node.next
+        if node.next is not self._head and node.next.priority == priority:
+            return node.next
+        return node.insert_after(_PriorityNode(priority))
+
+    def _promote(self, key, node):
+        """Move `key` from `node` to the bucket of the next priority and return that bucket."""
+        next_node = self._bucket_after(node, node.priority + 1)
+        del node.keys[key]
+        next_node.keys[key] = None
+        if not node.keys:
+            node.unlink()
+        return next_node
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        del entry.node.keys[key]
+        if not entry.node.keys:
+            entry.node.unlink()
+        self._expiry_order.pop(key, None)
+        self.current_bytes -= entry.size
+
+    def _evict(self):
+        """Drop the least recently used key of the lowest priority bucket and raise the age to its priority."""
+        node = self._head.next
+        self._age = node.priority
+        self._remove(next(iter(node.keys)))
+        self.evictions += 1
+
+
+class SQLiteStore(CacheStore):
+    """
+    Cache store kept in an SQLite file, shared by every process that opens the same path.
+
+    Entries survive restarts, so new workers start warm and several workers hold
+    one copy of the data instead of one each. Values are pickled and keys are
+    stored as `stable_key_hash` digests. Eviction follows the same priority and
+    aging policy as LFUStore, with the age kept in the database. Every thread
+    gets its own connection, and the database runs in WAL mode so readers in
+    other processes are not blocked by writers.
+
+    The entry count and byte total in `info()` describe the shared table, while
+    hits, misses, evictions and expirations are counted by this process only.
+
+    Attributes:
+        path (str): The path to the SQLite file.
+        table (str): The table holding the entries, one per cached function.
+        max_size (int): The maximum number of entries kept in the table.
+        max_bytes (int): The maximum total size of the values, or None for no limit.
+        ttl (float): The number of seconds an entry lives, or None to keep it until evicted.
+    """
+
+    def __init__(self, path, table='lfu_cache', max_size=1024, max_bytes=None, sizer=default_sizer, ttl=None):
+        if not table.isidentifier():
+            raise ValueError('table must be a valid identifier.')
+        if max_size <= 0:
+            raise ValueError('max_size must be a positive number.')
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError('max_bytes must be a positive number.')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be a positive number.')
+        self.path = os.path.abspath(path)
+        self.table = table
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.ttl = ttl
+        self._local = threading.local()
+        self._reset_statistics()
+        with self._transaction() as connection:
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key_hash TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    priority INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_eviction ON {table} (priority, last_used)")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_expiry ON {table} (expires_at)")
+            connection.execute("CREATE TABLE IF NOT EXISTS lfu_cache_age (name TEXT PRIMARY KEY, age INTEGER NOT NULL)")
+            connection.execute("INSERT OR IGNORE INTO lfu_cache_age (name, age) VALUES (?, 0)", (table,))
+
+    def get(self, key, default=MISSING):
+        """Return the value for `key` and bump its priority, or `default` on a miss."""
+        key_hash = stable_key_hash(key)
+        connection = self._connection()
+        row = connection.execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key_hash = ?", (key_hash,)
+        ).fetchone()
+        now = time.time()
+        if row is not None and row[1] is not None and row[1] <= now:
+            with self._transaction() as connection:
+                connection.execute(f"DELETE FROM {self.table} WHERE key_hash = ?", (key_hash,))
+            self.expirations += 1
+            row = None
+        if row is None:
+            self.misses += 1
+            return default
+        with self._transaction() as connection:
+            connection.execute(
+                f"UPDATE {self.table} SET priority = priority + 1, last_used = ? WHERE key_hash = ?",
+                (now, key_hash)
+            )
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`, evicting the lowest priority entries until it fits.
+
+        A value larger than `max_bytes` on its own is not stored at all.
+        """
+        size = self.sizer(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        key_hash = stable_key_hash(key)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+
+        with self._transaction() as connection:
+            connection.execute(f"DELETE FROM {self.table} WHERE key_hash = ?", (key_hash,))
+            age = connection.execute("SELECT age FROM lfu_cache_age WHERE name = ?", (self.table,)).fetchone()[0]
+            count, total_bytes = connection.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+            while count >= self.max_size or (self.max_bytes is not None and total_bytes + size > self.max_bytes):
+                victim_hash, victim_size, age = connection.execute(
+                    f"SELECT key_hash, size, priority FROM {self.table} ORDER BY priority, last_used LIMIT 1"
+                ).fetchone()
+                connection.execute(f"DELETE FROM {self.table} WHERE key_hash = ?", (victim_hash,))
+                count -= 1
+                total_bytes -= victim_size
+                self.evictions += 1
+            connection.execute(
+                f"INSERT INTO {self.table} (key_hash, value, size, priority, last_used, expires_at) "
+                f"VALUES (?, ?, ?, ?, ?, ?)",
+                (key_hash, blob, size, age + 1, now, expires_at)
+            )
+            connection.execute("UPDATE lfu_cache_age SET age = ? WHERE name = ?", (age, self.table))
+
+    def expire(self):
+        """Drop every entry whose TTL has run out and return how many were dropped."""
+        with self._transaction() as connection:
+            expired = connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+        self.expirations += expired
+        return expired
+
+    def clear(self):
+        """Remove every entry from the shared table and reset the statistics of this process."""
+        with self._transaction() as connection:
+            connection.execute(f"DELETE FROM {self.table}")
+            connection.execute("UPDATE lfu_cache_age SET age = 0 WHERE name = ?", (self.table,))
+        self._reset_statistics()
+
+    def info(self):
+        """Return the store statistics as a CacheInfo tuple."""
+        count, total_bytes = self._connection().execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        return CacheInfo(
+            self.hits, self.misses, self.max_size, count,
+            self.evictions, self.expirations, total_bytes, self.max_bytes
+        )
+
+    def _reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _connection(self):
+        """Return the connection of the current thread, opening a new one after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        """Run the block in a write transaction that other processes wait for."""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
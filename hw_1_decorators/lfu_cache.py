@@ -1,55 +1,220 @@
+import asyncio
 import functools
-import requests
+import logging
+import os
+import threading
 
-from collections import OrderedDict
+import http_client
+from cache_backends import MISSING, LFUStore, SQLiteStore, default_sizer
 
 
-def lfu_cache(max_size=3):
+logger = logging.getLogger(__name__)
+
+
+class _InFlightCall:
+    """A computation shared by every thread that missed the same key at the same time."""
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _make_key(args, kwargs):
+    return args, tuple(kwargs.items())
+
+
+def _store_result(store, key, result, func):
+    """
+    Put `result` into `store`, logging instead of raising when the store fails.
+
+    A failing sizer, a result that cannot be pickled or a locked SQLite file
+    only cost the caching: the caller still gets the computed result.
+    """
+    try:
+        store.put(key, result)
+    except Exception:
+        logger.warning('Could not cache the result of %s', func.__qualname__, exc_info=True)
+
+
+def _attach_cache(wrapper, store):
+    wrapper._cache = store
+    wrapper.cache_info = store.info
+    wrapper.cache_clear = store.clear
+    return wrapper
+
+
+def _start_sweeper(store, lock, interval):
+    """Expire stale entries of `store` every `interval` seconds from a daemon thread until the returned event is set."""
+    stopped = threading.Event()
+
+    def sweep():
+        while not stopped.wait(interval):
+            with lock:
+                store.expire()
+
+    threading.Thread(target=sweep, name='lfu-cache-sweeper', daemon=True).start()
+    return stopped
+
+
+def lfu_cache(max_size=3, thread_safe=False, max_bytes=None, sizer=default_sizer, ttl=None, sweep_interval=None,
+              store=None):
+    """
+    Cache the results of a function, evicting the least frequently used entry.
+
+    Args:
+        max_size (int): The maximum number of cached results.
+        thread_safe (bool): Guard the store with a lock and let concurrent misses
+            for the same key wait for a single call instead of running their own.
+        max_bytes (int): The maximum total size of cached results, or None for no limit.
+        sizer (callable): Returns the size of a result in bytes.
+        ttl (float): The number of seconds a result stays valid, or None to keep it until evicted.
+        sweep_interval (float): Drop expired results every `sweep_interval` seconds from a
+            background thread instead of only when they are looked up. Implies `thread_safe`.
+        store (CacheStore): Keep results in this store, for example a shared SQLiteStore,
+            instead of a new in-memory LFUStore built from the options above.
+    """
     def decorator(func):
+        cache_store = store if store is not None else LFUStore(max_size, max_bytes=max_bytes, sizer=sizer, ttl=ttl)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = (args, tuple(kwargs.items()))
-            if cache_key in wrapper._cache:
-                wrapper._cache.move_to_end(cache_key, last=True)
-                cache_item = wrapper._cache[cache_key]
-                cache_item['usage_count'] += 1
-                return cache_item['result']
+            cache_key = _make_key(args, kwargs)
+            result = cache_store.get(cache_key)
+            if result is not MISSING:
+                return result
             result = func(*args, **kwargs)
-            new_cache_item = {'result': result, 'usage_count': 1}
-            if len(wrapper._cache) >= max_size:
-                extra_key = min(wrapper._cache.items(), key=lambda item: item[1]['usage_count'])[0]
-                del wrapper._cache[extra_key]
-            wrapper._cache[cache_key] = new_cache_item
+            _store_result(cache_store, cache_key, result, func)
             return result
 
-        wrapper._cache = OrderedDict()
-        return wrapper
+        lock = threading.Lock()
+        in_flight = {}
+
+        @functools.wraps(func)
+        def thread_safe_wrapper(*args, **kwargs):
+            cache_key = _make_key(args, kwargs)
+            with lock:
+                result = cache_store.get(cache_key)
+                if result is not MISSING:
+                    return result
+                call = in_flight.get(cache_key)
+                is_leader = call is None
+                if is_leader:
+                    call = in_flight[cache_key] = _InFlightCall()
+
+            if not is_leader:
+                call.event.wait()
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                try:
+                    with lock:
+                        try:
+                            if call.error is None:
+                                _store_result(cache_store, cache_key, call.result, func)
+                        finally:
+                            del in_flight[cache_key]
+                finally:
+                    call.event.set()
+            return call.result
+
+        if sweep_interval:
+            thread_safe_wrapper.stop_sweeper = _start_sweeper(cache_store, lock, sweep_interval).set
+            return _attach_cache(thread_safe_wrapper, cache_store)
+        return _attach_cache(thread_safe_wrapper if thread_safe else wrapper, cache_store)
+
+    return decorator
+
+
+def async_lfu_cache(max_size=3, max_bytes=None, sizer=default_sizer, ttl=None, store=None):
+    """
+    Cache the results of a coroutine function, evicting the least frequently used entry.
+
+    Concurrent misses for the same key await one shared task, so the coroutine runs
+    once per key no matter how many callers are waiting for it. A caller that gets
+    cancelled does not cancel the shared task for the others.
+
+    Args:
+        max_size (int): The maximum number of cached results.
+        max_bytes (int): The maximum total size of cached results, or None for no limit.
+        sizer (callable): Returns the size of a result in bytes.
+        ttl (float): The number of seconds a result stays valid, or None to keep it until evicted.
+        store (CacheStore): Keep results in this store instead of a new in-memory LFUStore.
+    """
+    def decorator(coroutine_func):
+        cache_store = store if store is not None else LFUStore(max_size, max_bytes=max_bytes, sizer=sizer, ttl=ttl)
+        in_flight = {}
+
+        def finish(cache_key, task):
+            del in_flight[cache_key]
+            if not task.cancelled() and task.exception() is None:
+                _store_result(cache_store, cache_key, task.result(), coroutine_func)
+
+        @functools.wraps(coroutine_func)
+        async def wrapper(*args, **kwargs):
+            cache_key = _make_key(args, kwargs)
+            result = cache_store.get(cache_key)
+            if result is not MISSING:
+                return result
+            task = in_flight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(coroutine_func(*args, **kwargs))
+                in_flight[cache_key] = task
+                task.add_done_callback(functools.partial(finish, cache_key))
+            return await asyncio.shield(task)
+
+        return _attach_cache(wrapper, cache_store)
 
     return decorator
 
 
-@lfu_cache()
+FETCH_URL_CACHE_PATH = os.environ.get('FETCH_URL_CACHE_PATH')
+FETCH_URL_MAX_BYTES = 10 * 1024 * 1024
+FETCH_URL_TTL = 300
+
+
+def _fetch_url_store():
+    """Share fetch_url results between worker processes and restarts when FETCH_URL_CACHE_PATH is set."""
+    if FETCH_URL_CACHE_PATH:
+        return SQLiteStore(
+            FETCH_URL_CACHE_PATH, table='fetch_url', max_size=1024, max_bytes=FETCH_URL_MAX_BYTES, ttl=FETCH_URL_TTL
+        )
+    return LFUStore(3, max_bytes=FETCH_URL_MAX_BYTES, ttl=FETCH_URL_TTL)
+
+
+@lfu_cache(thread_safe=True, store=_fetch_url_store())
 def fetch_url(url, first_n=100):
     """Fetch content from a given URL"""
-    response = requests.get(url)
+    response = http_client.get(url)
     return response.content[:first_n] if first_n else response.content
 
-fetch_url('https://rozetka.com.ua/')
-fetch_url('https://rozetka.com.ua/')
-fetch_url('https://rozetka.com.ua/')
-fetch_url('https://ithillel.ua/')
-fetch_url('https://rozetka.com.ua/')
-fetch_url('https://ithillel.ua/')
-fetch_url('https://ithillel.ua/')
-fetch_url('https://ithillel.ua/')
-fetch_url('https://www.javascript.com/')
-fetch_url('https://www.javascript.com/')
-fetch_url('https://www.javascript.com/')
-fetch_url('https://ithillel.ua/')
-fetch_url('https://rozetka.com.ua/')
-fetch_url('https://www.github.com/')
-fetch_url('https://www.github.com/')
-fetch_url('https://www.github.com/')
-fetch_url('https://www.github.com/')
-fetch_url('https://www.github.com/')
-fetch_url('https://www.github.com/')
+
+if __name__ == '__main__':
+    fetch_url('https://rozetka.com.ua/')
+    fetch_url('https://rozetka.com.ua/')
+    fetch_url('https://rozetka.com.ua/')
+    fetch_url('https://ithillel.ua/')
+    fetch_url('https://rozetka.com.ua/')
+    fetch_url('https://ithillel.ua/')
+    fetch_url('https://ithillel.ua/')
+    fetch_url('https://ithillel.ua/')
+    fetch_url('https://www.javascript.com/')
+    fetch_url('https://www.javascript.com/')
+    fetch_url('https://www.javascript.com/')
+    fetch_url('https://ithillel.ua/')
+    fetch_url('https://rozetka.com.ua/')
+    fetch_url('https://www.github.com/')
+    fetch_url('https://www.github.com/')
+    fetch_url('https://www.github.com/')
+    fetch_url('https://www.github.com/')
+    fetch_url('https://www.github.com/')
+    fetch_url('https://www.github.com/')
+    print(fetch_url.cache_info())
@@ -1,27 +1,30 @@
-import psutil
-import functools
-import requests
+import http_client
+from profiling import RSS_DELTA, TRACEMALLOC_PEAK, export_prometheus, profile
 
 
-def measure_memory_usage(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        process = psutil.Process()
-        initial_memory = process.memory_info().rss
-        result = func(*args, **kwargs)
-        final_memory = process.memory_info().rss
-        memory_used = final_memory - initial_memory
-        print(f'Function {func.__name__} used {memory_used} bytes of memory')
-        return result
+def measure_memory_usage(func=None, trace_peak=False, sample_every=1):
+    """
+    Record the RSS delta of calls of `func`, and their tracemalloc peak with `trace_peak`.
 
-    return wrapper
+    The measurements go into the profile of the function instead of stdout;
+    read them with `profiling.snapshot()` or one of the exporters. Tracing the
+    peak starts tracemalloc for the whole process, which slows down every
+    allocation, so it is off unless asked for, best together with a
+    `sample_every` above 1. Use as `@measure_memory_usage` or
+    `@measure_memory_usage(trace_peak=True, sample_every=100)`.
+    """
+    metrics = (RSS_DELTA, TRACEMALLOC_PEAK) if trace_peak else (RSS_DELTA,)
+    decorator = profile(metrics=metrics, sample_every=sample_every)
+    return decorator if func is None else decorator(func)
 
 
 @measure_memory_usage
 def fetch_url(url, first_n=100):
     """Fetch the content of the given URL, returning the first N bytes"""
-    response = requests.get(url)
+    response = http_client.get(url)
     return response.content[:first_n] if first_n else response.content
 
 
-fetch_url("https://ithillel.ua/")
+if __name__ == '__main__':
+    fetch_url("https://ithillel.ua/")
+    print(export_prometheus())
@@ -0,0 +1,360 @@
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import psutil
+
+
+WALL_TIME = 'wall_time_ns'
+CPU_TIME = 'cpu_time_ns'
+RSS_DELTA = 'rss_delta_bytes'
+TRACEMALLOC_PEAK = 'tracemalloc_peak_bytes'
+ALLOCATED_BLOCKS = 'allocated_blocks'
+
+ALL_METRICS = (WALL_TIME, CPU_TIME, RSS_DELTA, TRACEMALLOC_PEAK, ALLOCATED_BLOCKS)
+DEFAULT_METRICS = (WALL_TIME, CPU_TIME, RSS_DELTA, ALLOCATED_BLOCKS)
+
+_enabled = os.environ.get('PROFILING_ENABLED', '1') != '0'
+_registry = {}
+_process = None
+# tracemalloc has one peak for the whole process, so one call at a time measures it.
+# The lock is only held to claim and release the peak, never while a call runs.
+_peak_lock = threading.Lock()
+_peak_busy = False
+_started_tracemalloc = False
+
+
+def _current_process():
+    """Return the psutil.Process of this process, created again in a forked child."""
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
+
+
+def enable():
+    """Turn profiling on for every decorated function."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Turn profiling off for every decorated function. Calls then cost one global lookup on top of the call.
+
+    Stops tracemalloc too if profiling started it for TRACEMALLOC_PEAK, or
+    once the call measuring the peak returns.
+    """
+    global _enabled
+    _enabled = False
+    with _peak_lock:
+        if not _peak_busy:
+            _stop_tracemalloc()
+
+
+def _stop_tracemalloc():
+    """Stop tracemalloc if profiling started it. Called with `_peak_lock` held."""
+    global _started_tracemalloc
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def _bucket(value):
+    """Return the upper bound of the power-of-two histogram bucket for `value`."""
+    if value <= 0:
+        return 0
+    return 1 << (int(value) - 1).bit_length()
+
+
+class FunctionProfile:
+    """
+    Measurements of one decorated function.
+
+    Every sample updates running totals: a count, a sum and a count per
+    histogram bucket for each metric, which only ever grow, as Prometheus
+    counters must. The updates take a lock held for a few additions. Samples
+    are also written into a fixed-size ring buffer, whose slots are claimed
+    with `next()` on an itertools.count, which is atomic under the GIL, so
+    only the oldest samples are overwritten. The JSON snapshot describes the
+    recent samples in the buffer.
+
+    Attributes:
+        name (str): The qualified name of the function.
+        metrics (tuple): The names of the measured metrics.
+        sample_every (int): Measure one call out of every `sample_every`.
+    """
+
+    def __init__(self, name, metrics, buffer_size, sample_every):
+        if buffer_size <= 0:
+            raise ValueError('buffer_size must be a positive number.')
+        if sample_every <= 0:
+            raise ValueError('sample_every must be a positive number.')
+        unknown = set(metrics) - set(ALL_METRICS)
+        if unknown:
+            raise ValueError(f'Unknown metrics: {", ".join(sorted(unknown))}.')
+        self.name = name
+        self.metrics = tuple(metrics)
+        self.sample_every = sample_every
+        self._calls = itertools.count()
+        self._slots = itertools.count()
+        self._samples = [None] * buffer_size
+        self._totals_lock = threading.Lock()
+        self._calls_total = 0
+        self._sampled_total = 0
+        self._counts = [0] * len(self.metrics)
+        self._sums = [0] * len(self.metrics)
+        self._buckets = [{} for _ in self.metrics]
+
+    def next_call(self):
+        """Count a call and return its index."""
+        return next(self._calls)
+
+    def record(self, call_index, values):
+        """
+        Store the measured `values` of one call, overwriting the oldest sample when the buffer is full.
+
+        A value of None means the metric was not measured for this call.
+        """
+        slot = next(self._slots)
+        self._samples[slot % len(self._samples)] = (slot, call_index, values)
+        with self._totals_lock:
+            self._calls_total = max(self._calls_total, call_index + 1)
+            self._sampled_total += 1
+            for position, value in enumerate(values):
+                if value is None:
+                    continue
+                self._counts[position] += 1
+                self._sums[position] += value
+                buckets = self._buckets[position]
+                bound = _bucket(value)
+                buckets[bound] = buckets.get(bound, 0) + 1
+
+    def totals(self):
+        """
+        Return the call counts and a histogram per metric of every sample since the function was decorated.
+
+        Unlike `snapshot`, no value ever decreases between two calls.
+        """
+        with self._totals_lock:
+            return {
+                'calls': self._calls_total,
+                'sampled': self._sampled_total,
+                'metrics': {
+                    metric: {
+                        'count': self._counts[position],
+                        'sum': self._sums[position],
+                        'buckets': dict(sorted(self._buckets[position].items())),
+                    }
+                    for position, metric in enumerate(self.metrics)
+                    if self._counts[position]
+                },
+            }
+
+    def snapshot(self):
+        """
+        Return the call counts and a histogram per metric built from the samples in the buffer.
+
+        `calls` counts up to the last sampled call, so it lags behind by less than `sample_every`.
+        """
+        samples = [sample for sample in list(self._samples) if sample is not None]
+        if not samples:
+            return {'calls': 0, 'sampled': 0, 'metrics': {}}
+
+        histograms = {}
+        for position, metric in enumerate(self.metrics):
+            values = [sample[2][position] for sample in samples if sample[2][position] is not None]
+            if not values:
+                continue
+            buckets = {}
+            for value in values:
+                bound = _bucket(value)
+                buckets[bound] = buckets.get(bound, 0) + 1
+            histograms[metric] = {
+                'count': len(values),
+                'sum': sum(values),
+                'min': min(values),
+                'max': max(values),
+                'buckets': dict(sorted(buckets.items())),
+            }
+
+        return {
+            'calls': max(sample[1] for sample in samples) + 1,
+            'sampled': max(sample[0] for sample in samples) + 1,
+            'metrics': histograms,
+        }
+
+
+def _measure(func, args, kwargs, metrics):
+    """Call `func` and return its result together with the values of `metrics`."""
+    if TRACEMALLOC_PEAK in metrics:
+        return _measure_peak(func, args, kwargs, metrics)
+    wall = WALL_TIME in metrics
+    cpu = CPU_TIME in metrics
+    rss = RSS_DELTA in metrics
+    blocks = ALLOCATED_BLOCKS in metrics
+
+    if rss:
+        rss_before = _current_process().memory_info().rss
+    if blocks:
+        blocks_before = sys.getallocatedblocks()
+    if cpu:
+        cpu_before = time.process_time_ns()
+    if wall:
+        wall_before = time.perf_counter_ns()
+
+    result = func(*args, **kwargs)
+
+    measured = {}
+    if wall:
+        measured[WALL_TIME] = time.perf_counter_ns() - wall_before
+    if cpu:
+        measured[CPU_TIME] = time.process_time_ns() - cpu_before
+    if blocks:
+        measured[ALLOCATED_BLOCKS] = sys.getallocatedblocks() - blocks_before
+    if rss:
+        measured[RSS_DELTA] = _current_process().memory_info().rss - rss_before
+
+    return result, tuple(measured[metric] for metric in metrics)
+
+
+def _claim_peak():
+    """Reset the tracemalloc peak for the caller and return True, or return False if another call is measuring it."""
+    global _peak_busy, _started_tracemalloc
+    with _peak_lock:
+        if _peak_busy:
+            return False
+        _peak_busy = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        # Python 3.8 has no reset_peak, and the peak there is the highest since tracing started.
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return True
+
+
+def _release_peak():
+    global _peak_busy
+    with _peak_lock:
+        _peak_busy = False
+        if not _enabled:
+            _stop_tracemalloc()
+
+
+def _measure_peak(func, args, kwargs, metrics):
+    """
+    `_measure` with TRACEMALLOC_PEAK among `metrics`.
+
+    One call at a time measures the peak: calls that start meanwhile, in other
+    threads or nested in the measuring call, run at once and record None for
+    it. No lock is held while `func` runs. The peak still counts what other
+    threads allocate during the call.
+    """
+    other_metrics = tuple(metric for metric in metrics if metric != TRACEMALLOC_PEAK)
+    if not _claim_peak():
+        result, values = _measure(func, args, kwargs, other_metrics)
+        measured = dict(zip(other_metrics, values))
+    else:
+        try:
+            traced_before = tracemalloc.get_traced_memory()[0]
+            result, values = _measure(func, args, kwargs, other_metrics)
+            measured = dict(zip(other_metrics, values))
+            measured[TRACEMALLOC_PEAK] = tracemalloc.get_traced_memory()[1] - traced_before
+        finally:
+            _release_peak()
+    return result, tuple(measured.get(metric) for metric in metrics)
+
+
+def profile(metrics=DEFAULT_METRICS, sample_every=1, buffer_size=1024):
+    """
+    Measure calls of the decorated function into its FunctionProfile.
+
+    Only sampled calls are measured, and each measurement costs a few clock
+    reads plus one system call when RSS is requested, and no lock is held
+    while the function runs. Tracing with tracemalloc slows down every
+    allocation in the process, so TRACEMALLOC_PEAK is not measured unless
+    asked for; the first such call starts tracemalloc for the whole process
+    until `disable()`, and only one call at a time records a peak. When
+    profiling is disabled, the wrapper only checks a global flag before
+    calling the function.
+
+    Args:
+        metrics (tuple): The metrics to measure, a subset of ALL_METRICS.
+        sample_every (int): Measure one call out of every `sample_every`.
+        buffer_size (int): The number of recent samples kept for the histograms.
+    """
+    def decorator(func):
+        function_profile = FunctionProfile(func.__qualname__, metrics, buffer_size, sample_every)
+        _registry[f'{func.__module__}.{func.__qualname__}'] = function_profile
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            call_index = function_profile.next_call()
+            if call_index % sample_every:
+                return func(*args, **kwargs)
+            result, values = _measure(func, args, kwargs, function_profile.metrics)
+            function_profile.record(call_index, values)
+            return result
+
+        wrapper.profile = function_profile
+        return wrapper
+
+    return decorator
+
+
+def snapshot():
+    """Return the snapshots of every profiled function keyed by its qualified name."""
+    return {name: function_profile.snapshot() for name, function_profile in list(_registry.items())}
+
+
+def export_json(indent=None):
+    """Return the snapshot of every profiled function as a JSON document."""
+    return json.dumps(snapshot(), indent=indent)
+
+
+def export_prometheus(prefix='profile'):
+    """
+    Return the totals of every profiled function in the Prometheus text exposition format.
+
+    Histograms cover every sampled call since the function was decorated, not
+    only the samples in the buffer, so their buckets, sums and counts never
+    decrease and `rate()` works on them.
+    """
+    lines = []
+    totals = {name: function_profile.totals() for name, function_profile in list(_registry.items())}
+
+    lines.append(f'# TYPE {prefix}_calls_total counter')
+    for name, function_totals in totals.items():
+        lines.append(f'{prefix}_calls_total{{function="{name}"}} {function_totals["calls"]}')
+
+    for metric in ALL_METRICS:
+        series = [
+            (name, function_totals['metrics'][metric])
+            for name, function_totals in totals.items()
+            if metric in function_totals['metrics']
+        ]
+        if not series:
+            continue
+        lines.append(f'# TYPE {prefix}_{metric} histogram')
+        for name, histogram in series:
+            cumulative = 0
+            for bound, count in histogram['buckets'].items():
+                cumulative += count
+                lines.append(f'{prefix}_{metric}_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_{metric}_bucket{{function="{name}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{prefix}_{metric}_sum{{function="{name}"}} {histogram["sum"]}')
+            lines.append(f'{prefix}_{metric}_count{{function="{name}"}} {histogram["count"]}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,42 @@
+import asyncio
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from lfu_cache import async_lfu_cache, fetch_url
+from local_server import LocalServer
+
+
+CONCURRENT_CALLERS = 20
+
+
+def run_threaded(server):
+    """Hit the same URL from many threads at once through the thread-safe `fetch_url`."""
+    with ThreadPoolExecutor(max_workers=CONCURRENT_CALLERS) as executor:
+        results = list(executor.map(fetch_url, [server.url] * CONCURRENT_CALLERS))
+    assert len(set(results)) == 1
+    return server.requests_served
+
+
+def run_async(server):
+    """Await the same URL from many coroutines at once through `async_lfu_cache`."""
+    def read(url):
+        with urllib.request.urlopen(url) as response:
+            return response.read()
+
+    @async_lfu_cache()
+    async def fetch_url_async(url):
+        return await asyncio.get_running_loop().run_in_executor(None, read, url)
+
+    async def main():
+        return await asyncio.gather(*(fetch_url_async(server.url) for _ in range(CONCURRENT_CALLERS)))
+
+    results = asyncio.run(main())
+    assert len(set(results)) == 1
+    return server.requests_served
+
+
+if __name__ == '__main__':
+    with LocalServer(delay=0.2) as server:
+        print(f'threads: {CONCURRENT_CALLERS} callers, {run_threaded(server)} upstream request(s)')
+    with LocalServer(delay=0.2) as server:
+        print(f'asyncio: {CONCURRENT_CALLERS} callers, {run_async(server)} upstream request(s)')
@@ -0,0 +1,58 @@
+import json
+from collections import Counter
+
+import http_client
+from background_refresh import BackgroundRefresher
+
+
+class AstronautFeed:
+    """
+    Keeps the astronauts feed in memory, refreshed in the background.
+
+    Every refresh counts the people per craft and serializes the response once,
+    so a request only reads the prepared bytes. Loading and refreshing is left
+    to a BackgroundRefresher that reloads the feed every `ttl` seconds.
+
+    Attributes:
+        url (str): The URL of the astronauts API.
+        feed (BackgroundRefresher): The refresher holding the feed and its JSON text.
+    """
+
+    def __init__(self, url, ttl=60):
+        self.url = url
+        self.feed = BackgroundRefresher('astronauts', self._load, interval=ttl)
+
+    @property
+    def last_refresh(self):
+        return self.feed.last_refresh
+
+    @property
+    def last_error(self):
+        return self.feed.last_error
+
+    def refresh(self):
+        self.feed.refresh()
+
+    def ensure_started(self):
+        self.feed.ensure_started()
+
+    def _load(self):
+        response = http_client.get(self.url)
+        response.raise_for_status()
+        return self._prepare(response.json())
+
+    @staticmethod
+    def _prepare(data):
+        """Add the per-craft counts to the feed and return it with its JSON text."""
+        data['statistics'] = dict(Counter(entry['craft'] for entry in data.get('people', [])))
+        return data, json.dumps(data)
+
+    def get(self):
+        """Return the feed with its per-craft counts under 'statistics'."""
+        data, _ = self.feed.get()
+        return data
+
+    def get_json(self):
+        """Return the feed as the JSON text prepared by the last successful refresh."""
+        _, text = self.feed.get()
+        return text
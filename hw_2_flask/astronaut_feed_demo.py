@@ -0,0 +1,33 @@
+"""
+Show the astronaut feed serving from memory, refreshing in the background and surviving an upstream outage.
+
+Run from this directory with `PYTHONPATH=.. python astronaut_feed_demo.py`.
+"""
+import json
+import time
+
+from astronaut_feed import AstronautFeed
+from local_server import LocalServer
+
+
+def people(*crafts):
+    return json.dumps({'message': 'success', 'number': len(crafts), 'people': [
+        {'name': f'Astronaut {index}', 'craft': craft} for index, craft in enumerate(crafts)
+    ]}).encode()
+
+
+if __name__ == '__main__':
+    with LocalServer(people('ISS', 'ISS', 'Tiangong'), content_type='application/json') as upstream:
+        feed = AstronautFeed(upstream.url, ttl=0.2)
+
+        for _ in range(1000):
+            feed.get_json()
+        print(f'1000 reads, {upstream.requests_served} upstream request(s): {feed.get()["statistics"]}')
+
+        upstream.body = people('ISS', 'ISS', 'ISS', 'Tiangong')
+        time.sleep(0.5)
+        print(f'after a background refresh: {feed.get()["statistics"]}')
+
+        upstream.available = False
+        time.sleep(0.5)
+        print(f'upstream down, last error {feed.last_error!r}, still serving: {feed.get()["statistics"]}')
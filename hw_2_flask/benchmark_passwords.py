@@ -0,0 +1,42 @@
+"""
+Compare the batch password generator with the original one-password-per-call loop.
+
+Run from this directory with `python benchmark_passwords.py [count]`.
+"""
+import secrets
+import string
+import sys
+import time
+
+from config import MIN_PASSWORD_LENGTH, MAX_PASSWORD_LENGTH, AVAILABLE_CHARACTERS
+from passwords import generate_passwords
+
+
+def generate_password_loop():
+    """The original `/generate_password` body: one `secrets.choice` call per character."""
+    password_length = secrets.randbelow(MAX_PASSWORD_LENGTH - MIN_PASSWORD_LENGTH + 1) + MIN_PASSWORD_LENGTH
+    password = [
+        secrets.choice(string.ascii_lowercase),
+        secrets.choice(string.ascii_uppercase),
+        secrets.choice(string.digits),
+        secrets.choice(string.punctuation)
+    ]
+    password += [secrets.choice(AVAILABLE_CHARACTERS) for _ in range(password_length - 4)]
+    secrets.SystemRandom().shuffle(password)
+    return ''.join(password)
+
+
+def measure(name, generate, count):
+    start = time.perf_counter()
+    generated = generate(count)
+    elapsed = time.perf_counter() - start
+    assert generated == count
+    print(f'{name:<8} {count:>9} passwords in {elapsed:6.2f}s  {count / elapsed:>12,.0f} passwords/s')
+    return count / elapsed
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    loop_rate = measure('loop', lambda n: sum(1 for _ in range(n) if generate_password_loop()), count)
+    batch_rate = measure('batch', lambda n: sum(1 for _ in generate_passwords(n)), count)
+    print(f'speedup  {batch_rate / loop_rate:.1f}x')
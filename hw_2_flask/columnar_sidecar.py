@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+from statistics_engine import CHUNK_SIZE, ColumnStatistics, compute_statistics
+from utils import clean_column_names
+
+
+SIDECAR_SUFFIX = '.columns'
+META_FILE = 'meta.json'
+
+
+def sidecar_path(csv_path):
+    """Return the directory holding the columnar sidecar of `csv_path`."""
+    return os.path.abspath(csv_path) + SIDECAR_SUFFIX
+
+
+def _count_rows(csv_path):
+    """Count the data lines of a CSV file without parsing it."""
+    lines = 0
+    last_byte = b'\n'
+    with open(csv_path, 'rb') as csv_file:
+        for block in iter(lambda: csv_file.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last_byte = block[-1:]
+    if last_byte != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def write_sidecar(csv_path, chunk_size=CHUNK_SIZE):
+    """
+    Convert the numeric columns of a CSV file into one `.npy` file per column.
+
+    The files go into `<csv_path>.columns/` together with `meta.json`, which
+    records the size and modification time of the CSV, the file of every
+    column, and the statistics of every column computed in the same pass.
+    The directory is written under a temporary name and renamed when complete,
+    so readers never see a half-written sidecar.
+    """
+    csv_path = os.path.abspath(csv_path)
+    stat = os.stat(csv_path)
+    target = sidecar_path(csv_path)
+    temporary = f'{target}.tmp-{os.getpid()}'
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+
+    expected_rows = _count_rows(csv_path)
+    columns = None
+    arrays = {}
+    statistics = {}
+    rows = 0
+    for chunk in pd.read_csv(csv_path, skipinitialspace=True, chunksize=chunk_size):
+        if columns is None:
+            numeric = chunk.select_dtypes('number')
+            columns = dict(zip(clean_column_names(numeric.copy()).columns, numeric.columns))
+            for column in columns:
+                arrays[column] = np.lib.format.open_memmap(
+                    os.path.join(temporary, f'{column}.npy'), mode='w+', dtype=np.float64, shape=(expected_rows,)
+                )
+                statistics[column] = ColumnStatistics()
+        for column, source in columns.items():
+            values = chunk[source].to_numpy(dtype=np.float64)
+            arrays[column][rows:rows + len(values)] = values
+            statistics[column].add_array(values)
+        rows += len(chunk)
+
+    for column, array in arrays.items():
+        array.flush()
+        if rows != expected_rows:
+            np.save(os.path.join(temporary, f'{column}.npy'), np.array(array[:rows]))
+    arrays.clear()
+
+    meta = {
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'rows': rows,
+        'columns': {column: f'{column}.npy' for column in columns or {}},
+        'statistics': {column: column_statistics.as_dict() for column, column_statistics in statistics.items()},
+    }
+    with open(os.path.join(temporary, META_FILE), 'w') as meta_file:
+        json.dump(meta, meta_file)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(temporary, target)
+    return target
+
+
+class Sidecar:
+    """
+    A fresh columnar sidecar of a CSV file.
+
+    Columns are memory-mapped on access, so reading one costs no parsing and
+    no copy until its values are used.
+
+    Attributes:
+        path (str): The sidecar directory.
+        rows (int): The number of rows in every column.
+        statistics (dict): The statistics of every column, keyed by cleaned column name.
+    """
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.rows = meta['rows']
+        self.statistics = meta['statistics']
+        self._files = meta['columns']
+
+    def __contains__(self, column):
+        return column in self._files
+
+    def column(self, name):
+        """Return the values of column `name` as a read-only memory-mapped array."""
+        return np.load(os.path.join(self.path, self._files[name]), mmap_mode='r')
+
+
+def load_sidecar(csv_path):
+    """Return the Sidecar of `csv_path`, or None if it is missing or older than the CSV."""
+    path = sidecar_path(csv_path)
+    try:
+        with open(os.path.join(path, META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+        stat = os.stat(csv_path)
+    except (OSError, ValueError):
+        return None
+    if meta['source_size'] != stat.st_size or meta['source_mtime_ns'] != stat.st_mtime_ns:
+        return None
+    return Sidecar(path, meta)
+
+
+def load_statistics(csv_path, columns):
+    """
+    Return the statistics of `columns` from the sidecar, or from the CSV when the sidecar is stale.
+
+    Raises the same errors as `compute_statistics` when it falls back to the CSV.
+    """
+    sidecar = load_sidecar(csv_path)
+    if sidecar is not None and all(column in sidecar for column in columns):
+        return {column: sidecar.statistics[column] for column in columns}
+    return compute_statistics(csv_path, columns)
+
+
+if __name__ == '__main__':
+    for csv_file_path in sys.argv[1:]:
+        print(f'{csv_file_path} -> {write_sidecar(csv_file_path)}')
@@ -1,8 +1,13 @@
+import os
 import string
 
 MIN_PASSWORD_LENGTH = 10
 MAX_PASSWORD_LENGTH = 20
+MAX_PASSWORD_BATCH = 1_000_000
 
 AVAILABLE_CHARACTERS = string.ascii_lowercase + string.ascii_uppercase + string.digits + string.punctuation
 
 columns_to_average = ['Height', 'Weight']
+
+ASTRONAUTS_URL = os.environ.get('ASTRONAUTS_URL', 'http://api.open-notify.org/astros.json')
+ASTRONAUTS_TTL = 60
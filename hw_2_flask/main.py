@@ -1,22 +1,22 @@
 from http import HTTPStatus
-from pprint import pprint
-import random
-import secrets
 import string
 
-import httpx
 import pandas as pd
-from flask import Flask, Response, abort
+from flask import Flask, Response, abort, jsonify
 from webargs.flaskparser import use_kwargs
 
-from config import MIN_PASSWORD_LENGTH, MAX_PASSWORD_LENGTH, AVAILABLE_CHARACTERS, columns_to_average
-from utils import clean_column_names
+from astronaut_feed import AstronautFeed
+from config import MIN_PASSWORD_LENGTH, MAX_PASSWORD_LENGTH, ASTRONAUTS_URL, ASTRONAUTS_TTL, columns_to_average
+from columnar_sidecar import load_statistics
+from passwords import generate_password as make_password, generate_passwords, iter_lines
 
-from validators import password_length_config
+from validators import password_length_config, password_batch_config
 
 
 app = Flask(__name__)
 
+astronaut_feed = AstronautFeed(ASTRONAUTS_URL, ttl=ASTRONAUTS_TTL)
+
 
 @app.route('/')
 def hello_world():
@@ -34,16 +34,7 @@ def generate_password() -> str:
     from 10 to 20 chars
     upper and lower case
     """
-    password_length = secrets.randbelow(MAX_PASSWORD_LENGTH - MIN_PASSWORD_LENGTH + 1) + MIN_PASSWORD_LENGTH
-    password = [
-        secrets.choice(string.ascii_lowercase),
-        secrets.choice(string.ascii_uppercase),
-        secrets.choice(string.digits),
-        secrets.choice(string.punctuation)
-    ]
-    password += [secrets.choice(AVAILABLE_CHARACTERS) for _ in range(password_length - 4)]
-    secrets.SystemRandom().shuffle(password)
-    return ''.join(password)
+    return make_password()
 
 
 @app.route('/generate_password2')
@@ -65,28 +56,39 @@ def generate_password2(length) -> str:
     # if not 8 <= password_length <= 100:
     #     return 'ERROR: Password length should be between 8 and 100.'
     
-    return ''.join(
-        random.choices(
-            string.digits + string.ascii_letters + string.punctuation, k=length
-        )
+    return make_password(
+        length, length, alphabet=string.digits + string.ascii_letters + string.punctuation, classes=()
     )
 
 
+@app.route('/generate_passwords')
+@use_kwargs(
+    password_batch_config,
+    location='query'
+)
+def generate_password_batch(count, length):
+    """
+    `count` passwords, one per line, streamed as they are generated
+    every password has lower and upper case letters, digits and punctuation
+    from 10 to 20 chars, or exactly `length` chars
+    """
+    min_length, max_length = (length, length) if length else (MIN_PASSWORD_LENGTH, MAX_PASSWORD_LENGTH)
+    passwords = generate_passwords(count, min_length, max_length)
+    return Response(iter_lines(passwords), mimetype='text/plain')
+
+
 @app.route('/get-astronauts')
 def get_astronauts():
-    url = 'http://api.open-notify.org/astros.json'
-    result = httpx.get(url=url, params={})
-    
-    if result.status_code not in (HTTPStatus.OK,):
-        return Response('ERROR: Failed to fetch data from the API.')
-    
-    result = result.json()
-    statistics = {}
-    for entry in result.get('people', {}):
-        statistics[entry['craft']] = statistics.get(entry['craft'], 0) + 1
-        
-    pprint(result)
-    return result
+    """
+    people in space from the cached feed, refreshed in the background
+    'statistics' holds the number of people per craft
+    """
+    try:
+        astronaut_feed.ensure_started()
+        payload = astronaut_feed.get_json()
+    except Exception:
+        return Response('ERROR: Failed to fetch data from the API.', status=HTTPStatus.BAD_GATEWAY)
+    return Response(payload, mimetype='application/json')
 
 
 @app.route('/avarage_statistics')
@@ -97,11 +99,11 @@ def calculate_average(filename='flask_hw_2.csv'):
     2.calculate average weight
     """
     try:
-        data_frame = pd.read_csv(filename)
-        formatted_data_frame = clean_column_names(data_frame)
-        average_values = {col: formatted_data_frame[col].mean() for col in columns_to_average}
+        statistics = load_statistics(filename, columns_to_average)
+        average_values = {col: statistics[col]['mean'] for col in columns_to_average}
+        formatted_values = {col: 'n/a' if value is None else f'{value:.2f}' for col, value in average_values.items()}
         list_items = ''.join(
-            f'<li>Average {col}: <b>{average_values[col]:.2f}</b></li>' for col in columns_to_average
+            f'<li>Average {col}: <b>{formatted_values[col]}</b></li>' for col in columns_to_average
         )
         return f'<ol>{list_items}</ol>'
     except FileNotFoundError:
@@ -115,4 +117,22 @@ def calculate_average(filename='flask_hw_2.csv'):
         return abort(500, description=f'An unexpected error occurred: {str(e)}')
 
 
-app.run(port=5001, debug=True)
+@app.route('/statistics')
+def get_statistics(filename='flask_hw_2.csv'):
+    """
+    csv file with students
+    count, mean, variance, min, max and quartiles of every averaged column
+    """
+    try:
+        return jsonify(load_statistics(filename, columns_to_average))
+    except FileNotFoundError:
+        return abort(404, description='File not found.')
+    except pd.errors.EmptyDataError:
+        return abort(400, description='CSV file is empty.')
+    except KeyError as e:
+        missing_column = str(e).strip("'")
+        return abort(400, description=f'Missing "{missing_column}" column in the CSV file.')
+
+
+if __name__ == '__main__':
+    app.run(port=5001, debug=True)
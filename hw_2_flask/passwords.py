@@ -0,0 +1,93 @@
+import itertools
+import os
+import string
+
+import numpy as np
+
+from config import MIN_PASSWORD_LENGTH, MAX_PASSWORD_LENGTH, AVAILABLE_CHARACTERS
+
+
+CHARACTER_CLASSES = (string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation)
+BATCH_SIZE = 4096
+
+
+def uniform_indices(size, count):
+    """
+    Return `count` cryptographically random integers in `[0, size)`.
+
+    Bytes are drawn from `os.urandom` in bulk. A byte is only kept when it is
+    below the largest multiple of `size` that fits in a byte, so every index
+    is equally likely. Other bytes are rejected and more are drawn.
+    """
+    if not 0 < size <= 256:
+        raise ValueError('size must be between 1 and 256')
+    limit = 256 - 256 % size
+    indices = np.empty(count, dtype=np.uint8)
+    filled = 0
+    while filled < count:
+        missing = count - filled
+        draw = np.frombuffer(os.urandom(missing * 256 // limit + 16), dtype=np.uint8)
+        accepted = draw[draw < limit][:missing]
+        indices[filled:filled + accepted.size] = accepted % size
+        filled += accepted.size
+    return indices
+
+
+def _class_masks(alphabet, classes):
+    """Return for every class a boolean array telling which alphabet characters belong to it."""
+    masks = np.array([[character in character_class for character in alphabet] for character_class in classes], dtype=bool)
+    if classes and not masks.any(axis=1).all():
+        raise ValueError('every character class needs at least one character in the alphabet')
+    return masks
+
+
+def generate_passwords(count, min_length=MIN_PASSWORD_LENGTH, max_length=MAX_PASSWORD_LENGTH,
+                       alphabet=AVAILABLE_CHARACTERS, classes=CHARACTER_CLASSES, batch_size=BATCH_SIZE):
+    """
+    Yield `count` random passwords, generated `batch_size` at a time.
+
+    Lengths are uniform between `min_length` and `max_length`, characters are
+    uniform over `alphabet`. Passwords missing a character of any of `classes`
+    are rejected and drawn again with the same length, so every password of a
+    given length that has all classes is equally likely.
+
+    Raises:
+        ValueError: If the lengths are invalid, or a class has no character in the alphabet.
+    """
+    if not max(len(classes), 1) <= min_length <= max_length:
+        raise ValueError('lengths must satisfy len(classes) <= min_length <= max_length')
+    characters = np.array(list(alphabet))
+    masks = _class_masks(alphabet, classes)
+    positions = np.arange(max_length)
+
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        lengths = min_length + uniform_indices(max_length - min_length + 1, size).astype(np.intp)
+        indices = np.empty((size, max_length), dtype=np.uint8)
+        pending = np.arange(size)
+        while pending.size:
+            indices[pending] = uniform_indices(len(alphabet), pending.size * max_length).reshape(-1, max_length)
+            in_password = positions < lengths[pending, None]
+            valid = np.ones(pending.size, dtype=bool)
+            for mask in masks:
+                valid &= (mask[indices[pending]] & in_password).any(axis=1)
+            pending = pending[~valid]
+
+        rows = characters[indices].view(f'<U{max_length}').ravel().tolist()
+        for row, length in zip(rows, lengths.tolist()):
+            yield row[:length]
+
+
+def generate_password(min_length=MIN_PASSWORD_LENGTH, max_length=MAX_PASSWORD_LENGTH,
+                      alphabet=AVAILABLE_CHARACTERS, classes=CHARACTER_CLASSES):
+    """Return one random password, see `generate_passwords`."""
+    return next(generate_passwords(1, min_length, max_length, alphabet, classes, batch_size=1))
+
+
+def iter_lines(passwords, batch_size=BATCH_SIZE):
+    """Yield `passwords` as text, one password per line, `batch_size` lines per chunk."""
+    while True:
+        batch = list(itertools.islice(passwords, batch_size))
+        if not batch:
+            return
+        yield '\n'.join(batch) + '\n'
@@ -0,0 +1,168 @@
+import copy
+import functools
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils import clean_column_names
+
+
+CHUNK_SIZE = 1_000_000
+QUANTILES = (0.25, 0.5, 0.75)
+RELATIVE_ACCURACY = 0.001
+
+
+class ColumnStatistics:
+    """
+    Mergeable running statistics of one numeric column.
+
+    Count, mean and the sum of squared deviations are combined with Chan's
+    parallel formula, so chunks can be accumulated in any order. Quantiles come
+    from a log-bucketed sketch: every value is counted in a bucket whose bounds
+    are within `RELATIVE_ACCURACY` of it, which keeps the sketch small and
+    mergeable at the price of that relative error.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = {}
+        self._negative = {}
+        self._zeros = 0
+
+    @property
+    def variance(self):
+        """The sample variance, or None for fewer than two values, where it is undefined."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def add_array(self, values):
+        """Accumulate a NumPy array of floats, ignoring NaNs."""
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        chunk = ColumnStatistics(self.relative_accuracy)
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        chunk._zeros = int((values == 0).sum())
+        chunk._positive = self._bucket_counts(values[values > 0])
+        chunk._negative = self._bucket_counts(-values[values < 0])
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Fold the statistics of `other`, built with the same accuracy, into this one."""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zeros += other._zeros
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+
+    def quantile(self, q):
+        """Return the approximate `q` quantile, or None if no values were added."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return max(-self._bucket_value(index), self.min)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+    def as_dict(self, quantiles=QUANTILES):
+        """Return the statistics as a dict that encodes to valid JSON, with None for the undefined ones."""
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else None,
+            'variance': self.variance,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'quantiles': {str(q): self.quantile(q) for q in quantiles},
+        }
+
+    def _bucket_counts(self, positive_values):
+        if not positive_values.size:
+            return {}
+        indexes, counts = np.unique(np.ceil(np.log(positive_values) / self._log_gamma), return_counts=True)
+        return dict(zip(indexes.astype(int).tolist(), counts.tolist()))
+
+    def _bucket_value(self, index):
+        """Return the value at the middle of a bucket, which is within the relative accuracy of its members."""
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+
+def _source_columns(filename, columns):
+    """Map every cleaned column name in `columns` to its name in the CSV header."""
+    header = pd.read_csv(filename, nrows=0, skipinitialspace=True)
+    raw_names = list(header.columns)
+    cleaned_names = clean_column_names(header).columns
+    mapping = dict(zip(cleaned_names, raw_names))
+    missing = [column for column in columns if column not in mapping]
+    if missing:
+        raise KeyError(missing[0])
+    return {column: mapping[column] for column in columns}
+
+
+@functools.lru_cache(maxsize=32)
+def _compute_statistics(filename, mtime_ns, size, columns, chunk_size):
+    source_columns = _source_columns(filename, columns)
+    statistics = {column: ColumnStatistics() for column in columns}
+    chunks = pd.read_csv(
+        filename,
+        usecols=list(source_columns.values()),
+        dtype={source: 'float64' for source in source_columns.values()},
+        skipinitialspace=True,
+        chunksize=chunk_size,
+    )
+    for chunk in chunks:
+        for column, source in source_columns.items():
+            statistics[column].add_array(chunk[source].to_numpy())
+    return {column: column_statistics.as_dict() for column, column_statistics in statistics.items()}
+
+
+def compute_statistics(filename, columns, chunk_size=CHUNK_SIZE):
+    """
+    Return count, mean, variance, min, max and quartiles of `columns` in a CSV file.
+
+    The file is read once in chunks of `chunk_size` rows, and only the requested
+    columns are parsed, as float64. Column names are matched after
+    `clean_column_names`. Results are cached by path, modification time and
+    size, so repeated calls only re-read the file after it changes. Every call
+    returns its own copy of the cached result, which the caller may modify.
+    Statistics that are undefined for the column, such as the variance of
+    fewer than two values, are None.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        pandas.errors.EmptyDataError: If the file is empty.
+        KeyError: If a column is missing from the file.
+    """
+    stat = os.stat(filename)
+    return copy.deepcopy(_compute_statistics(
+        os.path.abspath(filename), stat.st_mtime_ns, stat.st_size, tuple(columns), chunk_size
+    ))
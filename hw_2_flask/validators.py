@@ -1,5 +1,7 @@
 from webargs import fields, validate
 
+from config import MAX_PASSWORD_BATCH
+
 
 password_length_config = {
   'length': fields.Int(
@@ -7,3 +9,15 @@ password_length_config = {
     validate=validate.Range(min=8, max=100, max_inclusive=True)
   ),
 }
+
+
+password_batch_config = {
+  'count': fields.Int(
+    load_default=1,
+    validate=validate.Range(min=1, max=MAX_PASSWORD_BATCH, max_inclusive=True)
+  ),
+  'length': fields.Int(
+    load_default=None,
+    validate=validate.Range(min=8, max=100, max_inclusive=True)
+  ),
+}
@@ -1,18 +1,22 @@
-import os
+import math
+import secrets
 import httpx
 from http import HTTPStatus
 
-from flask import Flask, jsonify, render_template, abort, send_file, Response
-from faker import Faker
+from flask import Flask, jsonify, render_template, stream_template, Response
 from webargs.flaskparser import use_kwargs
-import pandas as pd
 
-from database_handler import execute_query
-from settings import CSV_FILE_PATH, BASE_CURRENCY_URL
-from validators import number_of_users_config, bitcoin_search_config
-from utils import generate_user_data, fetch_data, filter_by_code, get_currency_symbol
+from database_handler import stream_query
+from rates_service import RatesService
+from serialization import install, iter_json_array
+from settings import BASE_CURRENCY_URL, RATES_REFRESH_INTERVAL, MAX_SEED
+from validators import number_of_users_config, students_page_config, bitcoin_search_config, bitcoin_batch_search_config
+from student_generator import iter_csv, iter_users
 
 app = Flask(__name__)
+install(app)
+
+rates_service = RatesService(BASE_CURRENCY_URL, refresh_interval=RATES_REFRESH_INTERVAL)
 
 
 @app.errorhandler(HTTPStatus.NOT_FOUND)
@@ -33,34 +37,55 @@ def error_handling(error):
     return response
 
 
+def resolve_seed(seed):
+    """Return `seed`, or a new random seed when none was given."""
+    return secrets.randbelow(MAX_SEED + 1) if seed is None else seed
+
+
 @app.route('/generate-students')
-@use_kwargs(number_of_users_config, location='query')
-def generate_students(number_of_users):
-    """
-    Generates a specified number of student records, saves them to a CSV file, 
-    and renders a web page displaying the generated records.
+@use_kwargs(students_page_config, location='query')
+def generate_students(number_of_users, seed, page, per_page):
     """
-    faker_instance = Faker()
-    users = generate_user_data(faker_instance, number_of_users)
-
-    try:
-        data_frame = pd.DataFrame(users)
-        data_frame.to_csv(CSV_FILE_PATH, index=False)
-    except Exception as e:
-        abort(500, description=f'Error saving CSV: {e}')
+    Renders one page of a generation of students as a streamed web page.
 
-    return render_template('users.html', users=users)
+    A generation is identified by `number_of_users` and `seed`: the same pair
+    always gives the same students, on any day and in any worker, since
+    birthdays are counted from the fixed REFERENCE_DATE of the generator. So
+    the page links and the CSV download regenerate exactly the rows shown
+    instead of sharing a file on disk.
+    """
+    seed = resolve_seed(seed)
+    pages = math.ceil(number_of_users / per_page)
+    page = min(page, pages)
+    start = (page - 1) * per_page
+    users = iter_users(number_of_users, seed, start=start, stop=start + per_page)
+
+    return stream_template(
+        'users.html',
+        users=users,
+        number_of_users=number_of_users,
+        seed=seed,
+        page=page,
+        pages=pages,
+        per_page=per_page,
+    )
 
 
 @app.route('/download-csv')
-def download_csv():
+@use_kwargs(number_of_users_config, location='query')
+def download_csv(number_of_users, seed):
     """
-    Handles the download of the generated CSV file.
+    Streams a generation of students as a CSV file, chunk by chunk as it is generated.
+
+    The file name contains `number_of_users` and `seed`, so it names its content:
+    downloading it again, even on another day, gives the same bytes.
     """
-    if os.path.exists(CSV_FILE_PATH):
-        return send_file(CSV_FILE_PATH, as_attachment=True)
-    else:
-        abort(404, description='CSV file not found.')
+    seed = resolve_seed(seed)
+    return Response(
+        iter_csv(number_of_users, seed=seed),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=students-{number_of_users}-{seed}.csv'},
+    )
 
 
 @app.route('/get-bitcoin-value/bitcoin_rate')
@@ -68,15 +93,13 @@ def download_csv():
 def get_bitcoin_value(currency, amount_of_currency):
     """Fetch the Bitcoin value for a specified currency and conversion rate."""
     try:
-        rates_data = fetch_data(f'{BASE_CURRENCY_URL}/api/rates')
-        currencies_data = fetch_data(f'{BASE_CURRENCY_URL}/currencies').get('data', [])
-
-        filtered_currency_data = filter_by_code(rates_data, currency)
+        rates_service.ensure_started()
+        filtered_currency_data = rates_service.get_rate(currency)
         if not filtered_currency_data:
             return Response(f'ERROR: Currency {currency} not found.', status=HTTPStatus.BAD_REQUEST)
 
         total_amount_of_currency = amount_of_currency * filtered_currency_data['rate']
-        currency_symbol = get_currency_symbol(currencies_data, currency)
+        currency_symbol = rates_service.get_symbol(currency)
 
         context = {
             'filtered_currency_date': filtered_currency_data,
@@ -93,11 +116,43 @@ def get_bitcoin_value(currency, amount_of_currency):
         return Response(f'ERROR: An unexpected error occurred. {str(e)}', status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
+@app.route('/get-bitcoin-value/bitcoin_rates')
+@use_kwargs(bitcoin_batch_search_config, location='query')
+def get_bitcoin_values(currency, amount_of_currency):
+    """
+    Convert Bitcoin into several currencies in one call.
+
+    Currencies and amounts are paired by position, e.g.
+    `?currency=USD&currency=EUR&amount_of_currency=2&amount_of_currency=5`.
+    A currency without an amount converts 1 Bitcoin.
+    """
+    if len(amount_of_currency) > len(currency):
+        return Response('ERROR: More amounts than currencies.', status=HTTPStatus.BAD_REQUEST)
+    amounts = amount_of_currency + [1] * (len(currency) - len(amount_of_currency))
+
+    try:
+        rates_service.ensure_started()
+        conversions = []
+        not_found = []
+        for code, amount in zip(currency, amounts):
+            conversion = rates_service.convert(code, amount)
+            if conversion is None:
+                not_found.append(code)
+            else:
+                conversions.append(conversion)
+        return jsonify({'conversions': conversions, 'not_found': not_found})
+
+    except httpx.HTTPStatusError as e:
+        return Response(f'ERROR: Failed to fetch data from the API. {str(e)}', status=HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return Response(f'ERROR: An unexpected error occurred. {str(e)}', status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
 @app.route('/customers')
 def get_all_customers():
+    """Stream every customer as a JSON array of objects keyed by column name."""
     query = "SELECT * FROM customers"
-    data = execute_query(query=query)
-    return data
+    return Response(iter_json_array(stream_query(query, as_dicts=True)), mimetype='application/json')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,17 @@
+"""
+Prepare chinook.db for the app: switch it to write-ahead logging.
+
+Importing the app never changes the database file, so run this once before
+starting it, from this directory with `PYTHONPATH=.. python migrate.py`.
+Running it again changes nothing.
+"""
+from database_handler import database
+
+
+def migrate():
+    database.enable_wal()
+
+
+if __name__ == '__main__':
+    migrate()
+    print(f'Migrated {database.path}')
@@ -0,0 +1,70 @@
+from background_refresh import BackgroundRefresher
+from utils import fetch_data
+
+
+class RatesService:
+    """
+    Keeps Bitcoin rates and currency symbols in memory, refreshed in the background.
+
+    Both upstream feeds are indexed by currency code, so lookups are dict reads.
+    Loading and refreshing is left to a BackgroundRefresher that reloads the
+    feeds every `refresh_interval` seconds.
+
+    Attributes:
+        base_url (str): The base URL of the rates API.
+        feeds (BackgroundRefresher): The refresher holding the rates and symbols indexes.
+    """
+
+    def __init__(self, base_url, refresh_interval=60):
+        self.base_url = base_url
+        self.feeds = BackgroundRefresher('rates', self._load, interval=refresh_interval)
+
+    @property
+    def last_refresh(self):
+        return self.feeds.last_refresh
+
+    @property
+    def last_error(self):
+        return self.feeds.last_error
+
+    def refresh(self):
+        self.feeds.refresh()
+
+    def ensure_started(self):
+        self.feeds.ensure_started()
+
+    def _load(self):
+        """Fetch both feeds and return the rates and symbols indexes."""
+        rates_data = fetch_data(f'{self.base_url}/api/rates')
+        currencies_data = fetch_data(f'{self.base_url}/currencies')
+        return self._index(rates_data, currencies_data.get('data', []))
+
+    @staticmethod
+    def _index(rates_data, currencies_data):
+        rates = {entry['code']: entry for entry in rates_data}
+        symbols = {entry.get('code'): entry.get('symbol', '') for entry in currencies_data}
+        return rates, symbols
+
+    def get_rate(self, code):
+        """Return the rate entry of the currency `code`, or None if it is unknown."""
+        rates, _ = self.feeds.get()
+        return rates.get(code)
+
+    def get_symbol(self, code):
+        """Return the symbol of the currency `code`, or an empty string if it has none."""
+        _, symbols = self.feeds.get()
+        return symbols.get(code.upper(), '')
+
+    def convert(self, code, amount):
+        """Return the rate entry, total and symbol for `amount` Bitcoin in the currency `code`, or None if it is unknown."""
+        rate = self.get_rate(code)
+        if rate is None:
+            return None
+        return {
+            'code': rate['code'],
+            'name': rate.get('name'),
+            'rate': rate['rate'],
+            'amount': amount,
+            'total': amount * rate['rate'],
+            'symbol': self.get_symbol(code),
+        }
@@ -1,10 +1,13 @@
-import os
+MAX_NUMBER_OF_USERS = 10_000_000
 
+MIN_NUMBER_OF_USERS = 3
 
-CSV_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.csv')
+USERS_PER_PAGE = 100
 
-MAX_NUMBER_OF_USERS = 1000
+MAX_USERS_PER_PAGE = 1000
 
-MIN_NUMBER_OF_USERS = 3
+MAX_SEED = 2 ** 63 - 1
 
 BASE_CURRENCY_URL = 'https://bitpay.com'
+
+RATES_REFRESH_INTERVAL = 60
@@ -0,0 +1,187 @@
+import argparse
+import csv
+import functools
+import io
+import os
+import string
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+from faker import Faker
+
+
+FIELDNAMES = ['first_name', 'last_name', 'email', 'password', 'birthday']
+
+POOL_SIZE = 2000
+POOL_SEED = 0
+CHUNK_SIZE = 10_000
+PASSWORD_LENGTH = 12
+PASSWORD_ALPHABET = np.array(list(string.ascii_letters + string.digits + '!@#$%^&*()_+'))
+MIN_AGE = 18
+MAX_AGE = 60
+# Birthdays are ages counted back from this day, not from the day of the run,
+# so a seed gives the same students on any day.
+REFERENCE_DATE = date(2024, 1, 1)
+# Chunks submitted to the process pool ahead of the one being yielded, per worker.
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+class NamePools:
+    """
+    First names, last names and email domains drawn from Faker once.
+
+    Students are sampled from these pools with NumPy instead of calling the
+    Faker providers for every row. The same seed always gives the same pools.
+    """
+
+    def __init__(self, seed=None, size=POOL_SIZE):
+        faker_instance = Faker()
+        faker_instance.seed_instance(seed)
+        self.first_names = np.array(sorted({faker_instance.first_name() for _ in range(size)}))
+        self.last_names = np.array(sorted({faker_instance.last_name() for _ in range(size)}))
+        self.domains = np.array(sorted({faker_instance.free_email_domain() for _ in range(size // 10)}))
+
+
+def generate_columns(count, seed, pools, reference_date=REFERENCE_DATE):
+    """
+    Generate `count` students as one NumPy array per field.
+
+    All random values for the chunk are drawn in a few vectorized calls from
+    a PCG64 generator seeded with `seed`, and birthdays are counted back from
+    `reference_date`. The values are test data and must not be used as real
+    credentials.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+
+    first_names = pools.first_names[rng.integers(len(pools.first_names), size=count)]
+    last_names = pools.last_names[rng.integers(len(pools.last_names), size=count)]
+    domains = pools.domains[rng.integers(len(pools.domains), size=count)]
+    numbers = rng.integers(1, 10_000, size=count).astype(str)
+    emails = first_names
+    for part in ('.', last_names, numbers, '@', domains):
+        emails = np.char.add(emails, part)
+    emails = np.char.lower(emails)
+
+    password_characters = PASSWORD_ALPHABET[rng.integers(len(PASSWORD_ALPHABET), size=(count, PASSWORD_LENGTH))]
+    passwords = password_characters.view(f'<U{PASSWORD_LENGTH}').ravel()
+
+    ages_in_days = rng.integers(MIN_AGE * 365, MAX_AGE * 365, size=count)
+    birthdays = (np.datetime64(reference_date, 'D') - ages_in_days).astype(str)
+
+    return [first_names, last_names, emails, passwords, birthdays]
+
+
+@functools.lru_cache(maxsize=1)
+def default_pools():
+    """Return the NamePools shared by every generation, built on first use."""
+    return NamePools(POOL_SEED)
+
+
+def _chunk_seeds(count, seed, chunk_size):
+    """Split `count` rows into chunks, each with its own seed derived from `seed`."""
+    sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def iter_users(count, seed, start=0, stop=None, pools=None, chunk_size=CHUNK_SIZE, reference_date=REFERENCE_DATE):
+    """
+    Yield the students `start` to `stop` of a generation of `count` students as dicts.
+
+    Only the chunks overlapping the range are generated, so a page of a large
+    generation costs at most two chunks. The rows are the same as in
+    `iter_csv` for the same `count`, `seed`, `chunk_size` and `reference_date`.
+    """
+    pools = pools or default_pools()
+    stop = count if stop is None else min(stop, count)
+    chunk_start = 0
+    for size, chunk_seed in _chunk_seeds(count, seed, chunk_size):
+        chunk_stop = chunk_start + size
+        if chunk_stop > start and chunk_start < stop:
+            columns = generate_columns(size, chunk_seed, pools, reference_date)
+            rows = zip(*(column[max(start - chunk_start, 0):stop - chunk_start].tolist() for column in columns))
+            yield from (dict(zip(FIELDNAMES, row)) for row in rows)
+        if chunk_stop >= stop:
+            return
+        chunk_start = chunk_stop
+
+
+def generate_users(count, seed=None, pools=None, reference_date=REFERENCE_DATE):
+    """Generate `count` students as a list of dicts with the keys of FIELDNAMES."""
+    return list(iter_users(count, seed, pools=pools, reference_date=reference_date))
+
+
+_worker_pools = None
+
+
+def _init_worker(pools):
+    global _worker_pools
+    _worker_pools = pools
+
+
+def _render_chunk(size_and_seed, pools=None, reference_date=REFERENCE_DATE):
+    """Render one chunk of students as CSV text without a header."""
+    size, seed = size_and_seed
+    columns = generate_columns(size, seed, pools or _worker_pools, reference_date)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(zip(*(column.tolist() for column in columns)))
+    return buffer.getvalue()
+
+
+def iter_csv(count, seed=None, workers=1, chunk_size=CHUNK_SIZE, pools=None, reference_date=REFERENCE_DATE):
+    """
+    Yield the CSV text of `count` students chunk by chunk, header first.
+
+    Every chunk gets a seed spawned from `seed`, so the output only depends on
+    `seed`, `chunk_size` and `reference_date`, not on `workers` or the day of
+    the run. With more than one worker the chunks are generated in a process
+    pool and yielded in order. Only a few chunks per worker are submitted
+    ahead of the one being yielded, so a slow reader does not make rendered
+    chunks pile up in memory.
+    """
+    pools = pools or default_pools()
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(FIELDNAMES)
+    yield buffer.getvalue()
+
+    chunks = _chunk_seeds(count, seed, chunk_size)
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield _render_chunk(chunk, pools, reference_date)
+        return
+
+    in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pools,)) as executor:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_render_chunk, chunk, None, reference_date))
+                if len(pending) >= in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def write_csv(path, count, seed=None, workers=1, chunk_size=CHUNK_SIZE, reference_date=REFERENCE_DATE):
+    """Write `count` students to `path` as they are generated, without holding them all in memory."""
+    with open(path, 'w', newline='') as csv_file:
+        for text in iter_csv(count, seed=seed, workers=workers, chunk_size=chunk_size, reference_date=reference_date):
+            csv_file.write(text)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a CSV file of synthetic students.')
+    parser.add_argument('count', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--reference-date', type=date.fromisoformat, default=REFERENCE_DATE)
+    arguments = parser.parse_args()
+    write_csv(
+        arguments.path, arguments.count, seed=arguments.seed, workers=arguments.workers,
+        reference_date=arguments.reference_date,
+    )
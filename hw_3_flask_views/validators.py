@@ -1,12 +1,23 @@
 from webargs import fields, validate
 
-from settings import MIN_NUMBER_OF_USERS, MAX_NUMBER_OF_USERS
+from settings import MIN_NUMBER_OF_USERS, MAX_NUMBER_OF_USERS, USERS_PER_PAGE, MAX_USERS_PER_PAGE, MAX_SEED
 
 
 number_of_users_config = {
   'number_of_users': fields.Int(
     missing=MIN_NUMBER_OF_USERS,
     validate=validate.Range(min=MIN_NUMBER_OF_USERS, max=MAX_NUMBER_OF_USERS, max_inclusive=True)
+  ),
+  'seed': fields.Int(load_default=None, validate=validate.Range(min=0, max=MAX_SEED))
+}
+
+
+students_page_config = {
+  **number_of_users_config,
+  'page': fields.Int(load_default=1, validate=validate.Range(min=1)),
+  'per_page': fields.Int(
+    load_default=USERS_PER_PAGE,
+    validate=validate.Range(min=1, max=MAX_USERS_PER_PAGE, max_inclusive=True)
   )
 }
 
@@ -15,3 +26,9 @@ bitcoin_search_config = {
   'currency': fields.Str(load_default='USD'),
   'amount_of_currency': fields.Int(load_default=1, validate=validate.Range(min=1))
 }
+
+
+bitcoin_batch_search_config = {
+  'currency': fields.List(fields.Str(), required=True),
+  'amount_of_currency': fields.List(fields.Int(validate=validate.Range(min=1)), load_default=list)
+}
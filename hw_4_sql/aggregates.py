@@ -0,0 +1,154 @@
+from database_handler import execute_query, execute_script
+
+
+# Money is kept in integer cents so that incremental updates do not accumulate float error.
+# BEGIN IMMEDIATE takes the write lock up front, so concurrent migrations wait
+# for each other instead of failing with SQLITE_BUSY when upgrading a read lock.
+# A country has a row in sales_by_country only while it has invoices: the
+# triggers delete the row when its last invoice is deleted or moved away,
+# looking the country up in IX_InvoiceBillingCountry.
+AGGREGATES_SCHEMA = """
+BEGIN IMMEDIATE;
+
+CREATE INDEX IF NOT EXISTS IX_InvoiceBillingCountry ON invoices (BillingCountry);
+
+CREATE TABLE IF NOT EXISTS sales_by_country (
+    BillingCountry NVARCHAR(40) PRIMARY KEY,
+    TotalCents INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS aggregate_totals (
+    Name TEXT PRIMARY KEY,
+    Value INTEGER NOT NULL
+);
+
+INSERT INTO sales_by_country (BillingCountry, TotalCents)
+SELECT BillingCountry, SUM(CAST(ROUND(Total * 100) AS INTEGER))
+FROM invoices
+WHERE NOT EXISTS (SELECT 1 FROM aggregate_totals)
+GROUP BY BillingCountry;
+
+INSERT OR IGNORE INTO aggregate_totals (Name, Value)
+SELECT 'invoices_total_cents', COALESCE(SUM(CAST(ROUND(Total * 100) AS INTEGER)), 0) FROM invoices;
+
+INSERT OR IGNORE INTO aggregate_totals (Name, Value)
+SELECT 'invoice_items_total_cents', COALESCE(SUM(CAST(ROUND(UnitPrice * Quantity * 100) AS INTEGER)), 0)
+FROM invoice_items;
+
+INSERT OR IGNORE INTO aggregate_totals (Name, Value)
+SELECT 'tracks_milliseconds', COALESCE(SUM(Milliseconds), 0) FROM tracks;
+
+DELETE FROM sales_by_country
+WHERE NOT EXISTS (SELECT 1 FROM invoices WHERE invoices.BillingCountry IS sales_by_country.BillingCountry);
+
+CREATE TRIGGER IF NOT EXISTS invoices_aggregates_insert AFTER INSERT ON invoices
+BEGIN
+    INSERT INTO sales_by_country (BillingCountry, TotalCents)
+    VALUES (NEW.BillingCountry, CAST(ROUND(NEW.Total * 100) AS INTEGER))
+    ON CONFLICT (BillingCountry) DO UPDATE SET TotalCents = TotalCents + excluded.TotalCents;
+    UPDATE aggregate_totals SET Value = Value + CAST(ROUND(NEW.Total * 100) AS INTEGER)
+    WHERE Name = 'invoices_total_cents';
+END;
+
+DROP TRIGGER IF EXISTS invoices_aggregates_delete;
+CREATE TRIGGER invoices_aggregates_delete AFTER DELETE ON invoices
+BEGIN
+    UPDATE sales_by_country SET TotalCents = TotalCents - CAST(ROUND(OLD.Total * 100) AS INTEGER)
+    WHERE BillingCountry IS OLD.BillingCountry;
+    DELETE FROM sales_by_country
+    WHERE BillingCountry IS OLD.BillingCountry
+    AND NOT EXISTS (SELECT 1 FROM invoices WHERE BillingCountry IS OLD.BillingCountry);
+    UPDATE aggregate_totals SET Value = Value - CAST(ROUND(OLD.Total * 100) AS INTEGER)
+    WHERE Name = 'invoices_total_cents';
+END;
+
+DROP TRIGGER IF EXISTS invoices_aggregates_update;
+CREATE TRIGGER invoices_aggregates_update AFTER UPDATE OF Total, BillingCountry ON invoices
+BEGIN
+    UPDATE sales_by_country SET TotalCents = TotalCents - CAST(ROUND(OLD.Total * 100) AS INTEGER)
+    WHERE BillingCountry IS OLD.BillingCountry;
+    DELETE FROM sales_by_country
+    WHERE BillingCountry IS OLD.BillingCountry
+    AND NOT EXISTS (SELECT 1 FROM invoices WHERE BillingCountry IS OLD.BillingCountry);
+    INSERT INTO sales_by_country (BillingCountry, TotalCents)
+    VALUES (NEW.BillingCountry, CAST(ROUND(NEW.Total * 100) AS INTEGER))
+    ON CONFLICT (BillingCountry) DO UPDATE SET TotalCents = TotalCents + excluded.TotalCents;
+    UPDATE aggregate_totals
+    SET Value = Value - CAST(ROUND(OLD.Total * 100) AS INTEGER) + CAST(ROUND(NEW.Total * 100) AS INTEGER)
+    WHERE Name = 'invoices_total_cents';
+END;
+
+CREATE TRIGGER IF NOT EXISTS invoice_items_aggregates_insert AFTER INSERT ON invoice_items
+BEGIN
+    UPDATE aggregate_totals SET Value = Value + CAST(ROUND(NEW.UnitPrice * NEW.Quantity * 100) AS INTEGER)
+    WHERE Name = 'invoice_items_total_cents';
+END;
+
+CREATE TRIGGER IF NOT EXISTS invoice_items_aggregates_delete AFTER DELETE ON invoice_items
+BEGIN
+    UPDATE aggregate_totals SET Value = Value - CAST(ROUND(OLD.UnitPrice * OLD.Quantity * 100) AS INTEGER)
+    WHERE Name = 'invoice_items_total_cents';
+END;
+
+CREATE TRIGGER IF NOT EXISTS invoice_items_aggregates_update AFTER UPDATE OF UnitPrice, Quantity ON invoice_items
+BEGIN
+    UPDATE aggregate_totals
+    SET Value = Value - CAST(ROUND(OLD.UnitPrice * OLD.Quantity * 100) AS INTEGER)
+                      + CAST(ROUND(NEW.UnitPrice * NEW.Quantity * 100) AS INTEGER)
+    WHERE Name = 'invoice_items_total_cents';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tracks_aggregates_insert AFTER INSERT ON tracks
+BEGIN
+    UPDATE aggregate_totals SET Value = Value + NEW.Milliseconds WHERE Name = 'tracks_milliseconds';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tracks_aggregates_delete AFTER DELETE ON tracks
+BEGIN
+    UPDATE aggregate_totals SET Value = Value - OLD.Milliseconds WHERE Name = 'tracks_milliseconds';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tracks_aggregates_update AFTER UPDATE OF Milliseconds ON tracks
+BEGIN
+    UPDATE aggregate_totals SET Value = Value - OLD.Milliseconds + NEW.Milliseconds
+    WHERE Name = 'tracks_milliseconds';
+END;
+
+COMMIT;
+"""
+
+
+def install_aggregates():
+    """
+    Creates the summary tables and the triggers that keep them up to date.
+
+    The tables are filled from the source tables only the first time, after that
+    every insert, update and delete on invoices, invoice_items and tracks adjusts
+    them in the same transaction, so reading an aggregate is a primary key lookup.
+    Running it again upgrades the triggers of an earlier install.
+    Run by migrate.py, never when the app is imported.
+    """
+    execute_script(AGGREGATES_SCHEMA)
+
+
+def aggregates_installed():
+    """Returns True if `install_aggregates` has been run on the database."""
+    return bool(execute_query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aggregate_totals'"))
+
+
+def get_aggregate(name):
+    """Returns the value of a total from aggregate_totals, or 0 if it is missing."""
+    rows = execute_query("SELECT Value FROM aggregate_totals WHERE Name = ?", (name,))
+    return rows[0][0] if rows else 0
+
+
+def get_country_sales_cents(country):
+    """Returns the sum of invoice totals for `country` in cents, or None if it has no invoices."""
+    rows = execute_query("SELECT TotalCents FROM sales_by_country WHERE BillingCountry = ?", (country,))
+    return rows[0][0] if rows else None
+
+
+def get_all_country_sales_cents():
+    """Returns the sum of invoice totals in cents for every country."""
+    rows = execute_query("SELECT BillingCountry, TotalCents FROM sales_by_country ORDER BY BillingCountry")
+    return dict(rows)
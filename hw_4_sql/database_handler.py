@@ -1,22 +1,40 @@
 import os
 import sqlite3
-from contextlib import closing
+
+from database import get_database
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+database = get_database(os.path.join(basedir, 'chinook.db'))
+
 
 def execute_query(query, args=()):
     """Executes a given SQL query on the 'chinook.db' SQLite database and returns the result."""
-    path_to_db = os.path.join(basedir, 'chinook.db')
+    try:
+        records = database.execute(query, args)
+    except (sqlite3.DatabaseError, sqlite3.IntegrityError, sqlite3.OperationalError) as e:
+        print(f"Database error: {e}")
+        records = []
 
+    return records
+
+
+def execute_dicts(query, args=()):
+    """Executes a given SQL query on 'chinook.db' and returns the rows as dicts keyed by column name."""
     try:
-        with sqlite3.connect(path_to_db) as connection:
-            with closing(connection.cursor()) as cursor:
-                cursor.execute(query, args)
-                connection.commit()
-                records = cursor.fetchall()
+        records = database.execute_dicts(query, args)
     except (sqlite3.DatabaseError, sqlite3.IntegrityError, sqlite3.OperationalError) as e:
         print(f"Database error: {e}")
         records = []
 
     return records
+
+
+def stream_query(query, args=(), chunk_size=1000, as_dicts=False):
+    """Yields the rows of a read query on 'chinook.db' without loading them all into memory."""
+    return database.stream(query, args, chunk_size=chunk_size, as_dicts=as_dicts)
+
+
+def execute_script(script):
+    """Executes several SQL statements on the 'chinook.db' SQLite database, e.g. to set up tables and triggers."""
+    database.execute_script(script)
@@ -1,35 +1,52 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 
 from webargs import fields, validate
 from webargs.flaskparser import use_kwargs
 
-from database_handler import execute_query
+from aggregates import (
+    aggregates_installed, get_aggregate, get_country_sales_cents, get_all_country_sales_cents
+)
+from database_handler import execute_dicts, execute_query, stream_query
+from serialization import install, iter_json_lines
+from track_cache import MAX_TRACK_IDS, TrackCache, track_versions_installed
 
 
 app = Flask(__name__)
+install(app)
+
+if not aggregates_installed() or not track_versions_installed():
+    raise RuntimeError('chinook.db is not migrated yet, run `PYTHONPATH=.. python migrate.py` first.')
+
+track_cache = TrackCache()
+
+
+def cents_to_amount(cents):
+    return cents / 100 if cents is not None else None
 
 
 @app.route('/order-price/sales-country')
 @use_kwargs({'country': fields.Str(load_default=None)}, location='query')
 def get_country_sales(country: str = None):
-    """Retrieves the total sales amount either for a specific country or globally."""
+    """
+    Retrieves the total sales amount either for a specific country or globally.
+
+    The global answer also lists the total of every country.
+    """
     try:
         if country:
-            select_total_by_country_query = "SELECT SUM(Total) FROM invoices WHERE BillingCountry = ?"
-            total_by_country_data = execute_query(select_total_by_country_query, (country,))
-
             result = {
                 'country': f'Sum of sales for {country}',
-                'total': str(*total_by_country_data[0])
+                'total': str(cents_to_amount(get_country_sales_cents(country)))
             }
 
         else:
-            country_and_total_invoices_query = "SELECT SUM(Total) FROM invoices"
-            country_and_total_invoices_data = execute_query(query=country_and_total_invoices_query)
-
             result = {
                 'message': 'Sum of sales',
-                'total': str(*country_and_total_invoices_data[0])
+                'total': str(cents_to_amount(get_aggregate('invoices_total_cents'))),
+                'countries': {
+                    billing_country: cents_to_amount(cents)
+                    for billing_country, cents in get_all_country_sales_cents().items()
+                }
             }
 
         return jsonify(result), 200
@@ -41,94 +58,120 @@ def get_country_sales(country: str = None):
 def get_total_sales():
     """Retrieves the total sales amount from the invoice_items table."""
     try:
-        query = "SELECT SUM(UnitPrice * Quantity) as TotalSales FROM invoice_items"
-        total_sales = execute_query(query=query)
-
-        if total_sales:
-            total_sales = total_sales[0][0]
-        else:
-            total_sales = 0
+        total_sales = cents_to_amount(get_aggregate('invoice_items_total_cents'))
 
         return jsonify({'sales': total_sales})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+SALES_INFO_SELECT = """
+    SELECT 
+        invoices.InvoiceId AS invoice_id, 
+        invoices.BillingCountry AS billing_country, 
+        invoice_items.TrackId AS track_id, 
+        invoice_items.UnitPrice AS unit_price, 
+        invoice_items.Quantity AS quantity 
+    FROM invoices 
+    INNER JOIN invoice_items ON invoices.InvoiceId = invoice_items.InvoiceId
+"""
+
+SALES_INFO_PAGE_IDS_QUERY = "SELECT InvoiceId FROM invoices WHERE InvoiceId > ? ORDER BY InvoiceId LIMIT ?"
+
+SALES_INFO_PAGE_QUERY = SALES_INFO_SELECT + f"""
+    WHERE invoices.InvoiceId IN ({SALES_INFO_PAGE_IDS_QUERY})
+    ORDER BY invoices.InvoiceId, invoice_items.InvoiceLineId;
+"""
+
+DEFAULT_SALES_INFO_LIMIT = 100
+MAX_SALES_INFO_LIMIT = 1000
+
+
+def get_next_after_invoice_id(after_invoice_id, limit):
+    """
+    Returns the cursor of the page after the `limit` invoices following `after_invoice_id`, or None on the last page.
+
+    The cursor is taken from the invoice ids of the page, not from its lines,
+    so an invoice without lines neither ends the pagination early nor is skipped.
+    """
+    invoice_ids = execute_query(SALES_INFO_PAGE_IDS_QUERY, (after_invoice_id, limit))
+    return invoice_ids[-1][0] if len(invoice_ids) == limit else None
+
+
+def stream_sales_info(after_invoice_id, limit):
+    """Yields the sales lines as newline-delimited JSON, one line per invoice item."""
+    rows = stream_query(SALES_INFO_PAGE_QUERY, (after_invoice_id, limit), as_dicts=True)
+    return iter_json_lines(rows)
+
+
 @app.route('/order-price/sales-info')
-def get_sales_info():
-    """Retrieves sales information by joining invoices and invoice_items tables."""
+@use_kwargs(
+    {
+        'after_invoice_id': fields.Int(load_default=0, validate=validate.Range(min=0)),
+        'limit': fields.Int(load_default=None, validate=validate.Range(min=1)),
+        'stream': fields.Bool(load_default=False),
+    },
+    location='query'
+)
+def get_sales_info(after_invoice_id, limit, stream):
+    """
+    Retrieves sales information by joining invoices and invoice_items tables.
+
+    Pages are keyed by invoice: `limit` invoices after `after_invoice_id` with all
+    of their lines, plus the `next_after_invoice_id` cursor for the next page.
+    With `stream=true` the same page is sent as NDJSON while it is read from the
+    database, with the cursor in the `X-Next-After-Invoice-Id` header, which is
+    left out on the last page. `limit` is capped at MAX_SALES_INFO_LIMIT either way.
+    """
+    limit = min(limit or DEFAULT_SALES_INFO_LIMIT, MAX_SALES_INFO_LIMIT)
     try:
-        query = """
-            SELECT 
-                invoices.InvoiceId, 
-                invoices.BillingCountry, 
-                invoice_items.TrackId, 
-                invoice_items.UnitPrice, 
-                invoice_items.Quantity 
-            FROM invoices 
-            INNER JOIN invoice_items ON invoices.InvoiceId = invoice_items.InvoiceId;
-        """
-        results = execute_query(query=query)
-
-        sales_info = [
-            {
-                "invoice_id": row[0],
-                "billing_country": row[1],
-                "track_id": row[2],
-                "unit_price": row[3],
-                "quantity": row[4]
-            }
-            for row in results
-        ]
+        next_after_invoice_id = get_next_after_invoice_id(after_invoice_id, limit)
+
+        if stream:
+            headers = {}
+            if next_after_invoice_id is not None:
+                headers['X-Next-After-Invoice-Id'] = str(next_after_invoice_id)
+            return Response(
+                stream_sales_info(after_invoice_id, limit), mimetype='application/x-ndjson', headers=headers
+            )
 
-        return jsonify({"sales_info": sales_info})
+        sales_info = execute_dicts(SALES_INFO_PAGE_QUERY, (after_invoice_id, limit))
+
+        return jsonify({"sales_info": sales_info, "next_after_invoice_id": next_after_invoice_id})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/track-info')
-@use_kwargs({'track_id': fields.Int(load_default=12, validate=validate.Range(min=1))}, location='query')
-def get_info_about_track(track_id):
+@use_kwargs(
+    {
+        'track_id': fields.Int(load_default=12, validate=validate.Range(min=1)),
+        'ids': fields.DelimitedList(
+            fields.Int(validate=validate.Range(min=1)),
+            load_default=None,
+            validate=validate.Length(min=1, max=MAX_TRACK_IDS)
+        ),
+    },
+    location='query'
+)
+def get_info_about_track(track_id, ids):
     """
     Retrieve detailed information about a track based on its ID.
+
+    With `ids=1,2,3` the tracks are returned together, in the requested order,
+    with the ids that do not exist listed under `not_found`.
     """
     try:
-        query = """
-            SELECT 
-                tracks.TrackId, 
-                tracks.Name AS TrackName, 
-                albums.Title AS AlbumTitle, 
-                artists.Name AS ArtistName, 
-                genres.Name AS GenreName, 
-                tracks.Composer, 
-                tracks.Milliseconds, 
-                tracks.Bytes, 
-                tracks.UnitPrice 
-            FROM tracks
-            JOIN albums ON tracks.AlbumId = albums.AlbumId
-            JOIN artists ON albums.ArtistId = artists.ArtistId
-            JOIN genres ON tracks.GenreId = genres.GenreId
-            WHERE tracks.TrackId = ?;
-        """
-
-        data = execute_query(query, (track_id,))
-
-        if not data:
-            return jsonify({"error": "Track not found"}), 404
-
-        track_info = {
-            "track_id": data[0][0],
-            "track_name": data[0][1],
-            "album_title": data[0][2],
-            "artist_name": data[0][3],
-            "genre_name": data[0][4],
-            "composer": data[0][5],
-            "milliseconds": data[0][6],
-            "bytes": data[0][7],
-            "unit_price": data[0][8]
-        }
-
-        return jsonify(track_info)
+        if ids is None:
+            track_info = track_cache.get(track_id)
+            if track_info is None:
+                return jsonify({"error": "Track not found"}), 404
+            return jsonify(track_info)
+
+        records = track_cache.get_many(ids)
+        tracks = [records[track_id] for track_id in dict.fromkeys(ids) if track_id in records]
+        not_found = [track_id for track_id in dict.fromkeys(ids) if track_id not in records]
+        return jsonify({"tracks": tracks, "not_found": not_found})
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -138,10 +181,7 @@ def get_info_about_track(track_id):
 def get_tracks_duration():
     """Retrieves the total duration of all tracks in hours."""
     try:
-        query = "SELECT SUM(Milliseconds) / 3600000 AS TotalHours FROM tracks;"
-        result = execute_query(query=query)
-
-        total_hours = result[0][0] if result and result[0][0] is not None else 0
+        total_hours = get_aggregate('tracks_milliseconds') // 3600000
 
         return jsonify({'tracks_duration_hours': total_hours}), 200
     except Exception as e:
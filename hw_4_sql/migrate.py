@@ -0,0 +1,23 @@
+"""
+Prepare chinook.db for the app: switch it to write-ahead logging, install the
+summary tables with the triggers that keep them up to date, and the triggers
+that version the track catalog for the track cache.
+
+Importing the app never changes the database file, so run this once before
+starting it, from this directory with `PYTHONPATH=.. python migrate.py`.
+Running it again changes nothing.
+"""
+from aggregates import install_aggregates
+from database_handler import database
+from track_cache import install_track_versions
+
+
+def migrate():
+    database.enable_wal()
+    install_aggregates()
+    install_track_versions()
+
+
+if __name__ == '__main__':
+    migrate()
+    print(f'Migrated {database.path}')
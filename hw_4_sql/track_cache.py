@@ -0,0 +1,147 @@
+import json
+import threading
+from collections import OrderedDict
+
+from database_handler import execute_dicts, execute_query, execute_script
+
+
+TRACK_CACHE_SIZE = 10000
+MAX_TRACK_IDS = 5000
+
+# Every write to a table a track record is joined from bumps the catalog version,
+# in the same transaction, whichever process or connection makes it.
+TRACK_TABLES = ('tracks', 'albums', 'artists', 'genres')
+
+TRACK_VERSION_SCHEMA = """
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    Name TEXT PRIMARY KEY,
+    Version INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO table_versions (Name, Version) VALUES ('track_catalog', 0);
+""" + ''.join(
+    f"""
+CREATE TRIGGER IF NOT EXISTS {table}_track_catalog_{event.lower()} AFTER {event} ON {table}
+BEGIN
+    UPDATE table_versions SET Version = Version + 1 WHERE Name = 'track_catalog';
+END;
+"""
+    for table in TRACK_TABLES
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+) + """
+COMMIT;
+"""
+
+TRACK_INFO_QUERY = """
+    SELECT
+        tracks.TrackId AS track_id,
+        tracks.Name AS track_name,
+        albums.Title AS album_title,
+        artists.Name AS artist_name,
+        genres.Name AS genre_name,
+        tracks.Composer AS composer,
+        tracks.Milliseconds AS milliseconds,
+        tracks.Bytes AS bytes,
+        tracks.UnitPrice AS unit_price
+    FROM json_each(?) AS ids
+    JOIN tracks ON tracks.TrackId = ids.value
+    JOIN albums ON tracks.AlbumId = albums.AlbumId
+    JOIN artists ON albums.ArtistId = artists.ArtistId
+    JOIN genres ON tracks.GenreId = genres.GenreId;
+"""
+
+
+def install_track_versions():
+    """
+    Creates the table_versions table and the triggers that bump the track catalog version on every write.
+
+    Run by migrate.py, never when the app is imported.
+    """
+    execute_script(TRACK_VERSION_SCHEMA)
+
+
+def track_versions_installed():
+    """Returns True if `install_track_versions` has been run on the database."""
+    return bool(execute_query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'table_versions'"))
+
+
+def get_track_catalog_version():
+    """Returns the current version of the track catalog, or None if the triggers are not installed."""
+    rows = execute_query("SELECT Version FROM table_versions WHERE Name = 'track_catalog'")
+    return rows[0][0] if rows else None
+
+
+class TrackCache:
+    """
+    An LRU cache of track records in front of the four-way track join.
+
+    Before every lookup the catalog version maintained by the triggers is read.
+    When it differs from the version the cached records were read at, the
+    whole cache is dropped, so a write to tracks, albums, artists or genres is
+    never served stale. Missing records of a lookup are fetched in one query.
+
+    Attributes:
+        max_size (int): The maximum number of cached track records.
+        hits (int): The number of records served from the cache.
+        misses (int): The number of records read from the database.
+    """
+
+    def __init__(self, max_size=TRACK_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._records = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_many(self, track_ids):
+        """
+        Returns the records of `track_ids` that exist, keyed by track id.
+
+        Every id costs a dict lookup when cached; all the others are read
+        together with one join over `json_each`.
+        """
+        version = get_track_catalog_version()
+        found = {}
+        missing = []
+        with self._lock:
+            if version is None or version != self._version:
+                self._records.clear()
+                self._version = version
+            for track_id in dict.fromkeys(track_ids):
+                record = self._records.get(track_id)
+                if record is None:
+                    missing.append(track_id)
+                else:
+                    self._records.move_to_end(track_id)
+                    found[track_id] = record
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            fetched = {record['track_id']: record for record in execute_dicts(TRACK_INFO_QUERY, (json.dumps(missing),))}
+            found.update(fetched)
+            self._store(fetched, version)
+        return found
+
+    def get(self, track_id):
+        """Returns the record of `track_id`, or None if there is no such track."""
+        return self.get_many([track_id]).get(track_id)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._version = None
+
+    def _store(self, records, version):
+        """Caches `records` read at `version`, unless a newer version was seen while they were read."""
+        if version is None:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._records.update(records)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
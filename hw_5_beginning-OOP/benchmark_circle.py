@@ -0,0 +1,47 @@
+"""
+Compare the batch point-in-circle functions with a loop over Circle.contains.
+
+Run from this directory with `python benchmark_circle.py`.
+"""
+import importlib
+import time
+
+import numpy as np
+
+# The module name starts with a Cyrillic "с", so it is imported by its exact name.
+circle_module = importlib.import_module('сircle')
+Circle, Point, circles_contain = circle_module.Circle, circle_module.Point, circle_module.circles_contain
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+
+    points = rng.uniform(-180, 180, size=(1_000_000, 2))
+    point_objects = [Point(x, y) for x, y in points.tolist()]
+    circle = Circle(10, 20, 45)
+    loop_mask, loop_time = timed(lambda: [circle.contains(point) for point in point_objects])
+    batch_mask, batch_time = timed(lambda: circle.contains_points(points))
+    assert batch_mask.tolist() == loop_mask
+    print(f'1 circle x {len(points):,} points:   loop {loop_time:6.2f}s  batch {batch_time:6.3f}s  '
+          f'{loop_time / batch_time:6.0f}x')
+
+    circles = np.column_stack([rng.uniform(-180, 180, size=(1000, 2)), rng.uniform(0.5, 5, size=1000)])
+    circle_objects = [Circle(x, y, radius) for x, y, radius in circles.tolist()]
+    sample = point_objects[:2000]
+    loop_hits, loop_time = timed(
+        lambda: [next((index for index, item in enumerate(circle_objects) if item.contains(point)), -1) for point in sample]
+    )
+    batch_hits, batch_time = timed(lambda: circles_contain(points[:2000], circles, first_hit=True))
+    assert batch_hits.tolist() == loop_hits
+    print(f'{len(circles):,} circles x {len(sample):,} points: loop {loop_time:6.2f}s  batch {batch_time:6.3f}s  '
+          f'{loop_time / batch_time:6.0f}x')
+
+    _, batch_time = timed(lambda: circles_contain(points, circles, first_hit=True))
+    print(f'{len(circles):,} circles x {len(points):,} points first hit: batch {batch_time:6.2f}s  '
+          f'({len(points) * len(circles) / batch_time / 1e6:,.0f}M pairs/s)')
@@ -1,17 +1,15 @@
 import os
 
-import sqlite3
+from database import get_database
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+database = get_database(os.path.join(basedir, 'chinook.db'))
+
 
 def execute_query(query, args=()):
-    path_to_db = os.path.join(basedir, 'chinook.db')
-    with sqlite3.connect(path_to_db) as connection:
-        cursor = connection.cursor()
-        cursor.execute(query, args)
-        connection.commit()
+    return database.execute(query, args)
 
-        records = cursor.fetchall()
 
-    return records
+def execute_script(script):
+    database.execute_script(script)
@@ -0,0 +1,123 @@
+import threading
+
+from database_handler import execute_query, execute_script
+
+
+COVERING_INDEXES = """
+BEGIN IMMEDIATE;
+CREATE INDEX IF NOT EXISTS IX_InvoiceLineInvoiceTrack ON invoice_items (InvoiceId, TrackId);
+CREATE INDEX IF NOT EXISTS IX_InvoiceLineTrackInvoice ON invoice_items (TrackId, InvoiceId);
+CREATE INDEX IF NOT EXISTS IX_TrackGenreTrack ON tracks (GenreId, TrackId);
+CREATE INDEX IF NOT EXISTS IX_GenreName ON genres (Name);
+COMMIT;
+"""
+
+PURCHASES_BY_GENRE_AND_CITY_QUERY = """
+    SELECT
+        genres.Name,
+        customers.City,
+        COUNT(*)
+    FROM
+        customers
+        JOIN invoices ON customers.CustomerId = invoices.CustomerId
+        JOIN invoice_items ON invoices.InvoiceId = invoice_items.InvoiceId
+        JOIN tracks ON invoice_items.TrackId = tracks.TrackId
+        JOIN genres ON tracks.GenreId = genres.GenreId
+    WHERE
+        invoice_items.InvoiceLineId > ? AND invoice_items.InvoiceLineId <= ?
+    GROUP BY
+        genres.Name,
+        customers.City
+"""
+
+
+def install_covering_indexes():
+    """
+    Create indexes that let the genre/city join read invoice_items and tracks from indexes only.
+
+    Run by migrate.py, never when the app is imported. Without them the
+    queries give the same results, only slower.
+    """
+    execute_script(COVERING_INDEXES)
+
+
+class GenrePopularityIndex:
+    """
+    Purchase counts for every (genre, city) pair with the cities of each genre ranked.
+
+    The index is built with one grouped query. Invoice lines are only ever
+    appended, so `refresh` counts the lines added since the last build and
+    re-ranks only the genres they touch. The check for new lines reads the
+    largest InvoiceLineId, which SQLite answers from the end of the table.
+
+    Readers never take the lock: a refresh builds a new rankings dict and
+    swaps it in with one assignment, so a reader sees either the old or the
+    new rankings, never a dict that is being changed.
+
+    Attributes:
+        last_invoice_line_id (int): The largest InvoiceLineId included in the counts.
+    """
+
+    def __init__(self):
+        self.last_invoice_line_id = 0
+        self._counts = {}
+        self._rankings = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Add the invoice lines written since the last refresh to the counts."""
+        latest_invoice_line_id = execute_query("SELECT COALESCE(MAX(InvoiceLineId), 0) FROM invoice_items")[0][0]
+        if latest_invoice_line_id == self.last_invoice_line_id:
+            return
+        with self._lock:
+            if latest_invoice_line_id <= self.last_invoice_line_id:
+                return
+            rows = execute_query(
+                PURCHASES_BY_GENRE_AND_CITY_QUERY, (self.last_invoice_line_id, latest_invoice_line_id)
+            )
+            changed_genres = set()
+            for genre, city, purchase_count in rows:
+                genre_counts = self._counts.setdefault(genre, {})
+                genre_counts[city] = genre_counts.get(city, 0) + purchase_count
+                changed_genres.add(genre)
+            rankings = dict(self._rankings)
+            for genre in changed_genres:
+                rankings[genre] = self._rank(self._counts[genre])
+            self._rankings = rankings
+            self.last_invoice_line_id = latest_invoice_line_id
+
+    def top_cities(self, genre, top=1):
+        """
+        Return the cities of `genre` whose purchase count is among the `top` highest counts.
+
+        Cities with the same count share a rank, like DENSE_RANK() in SQL.
+        """
+        self.refresh()
+        return self._top_cities(genre, top)
+
+    def top_cities_by_genre(self, top=1):
+        """Return `top_cities` for every genre, keyed by genre name."""
+        self.refresh()
+        rankings = self._rankings
+        return {genre: self._top_cities(genre, top, rankings) for genre in sorted(rankings)}
+
+    def _top_cities(self, genre, top, rankings=None):
+        rankings = self._rankings if rankings is None else rankings
+        return [
+            {'city': city, 'genre': genre, 'purchase_count': purchase_count}
+            for city, purchase_count, rank in rankings.get(genre, ())
+            if rank <= top
+        ]
+
+    @staticmethod
+    def _rank(city_counts):
+        """Return (city, purchase_count, dense_rank) tuples ordered by purchase count, highest first."""
+        ranked = []
+        rank = 0
+        previous_count = None
+        for city, purchase_count in sorted(city_counts.items(), key=lambda item: (-item[1], item[0])):
+            if purchase_count != previous_count:
+                rank += 1
+                previous_count = purchase_count
+            ranked.append((city, purchase_count, rank))
+        return ranked
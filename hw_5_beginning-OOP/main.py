@@ -1,11 +1,14 @@
 from flask import Flask, jsonify
-from webargs import fields
+from webargs import fields, validate
 from webargs.flaskparser import use_kwargs
-from database_handler import execute_query
+from genre_popularity import GenrePopularityIndex
 
 
 app = Flask(__name__)
 
+genre_popularity = GenrePopularityIndex()
+genre_popularity.refresh()
+
 
 @app.route('/popular_genres_by_city')
 @use_kwargs({'genre': fields.Str(load_default=None)}, location='query')
@@ -38,53 +41,28 @@ def get_popular_genre_cities(genre):
         }
     ]
     """
-    if genre:
-        query = """
-        SELECT
-            City,
-            Name AS Genre,
-            GenreCounts AS PurchaseCount
-        FROM
-            (SELECT
-                customers.City,
-                genres.Name,
-                COUNT(*) AS GenreCounts,
-                DENSE_RANK() OVER (PARTITION BY genres.Name ORDER BY COUNT(*) DESC) AS DRank
-            FROM
-                customers
-                JOIN invoices ON customers.CustomerId = invoices.CustomerId
-                JOIN invoice_items ON invoices.InvoiceId = invoice_items.InvoiceId
-                JOIN tracks ON invoice_items.TrackId = tracks.TrackId
-                JOIN genres ON tracks.GenreId = genres.GenreId
-            WHERE
-                genres.Name = ?
-            GROUP BY
-                customers.City,
-                genres.Name) AS ranked_cities
-        WHERE
-            DRank = 1
-        ORDER BY
-            GenreCounts DESC
-        ;
-        """
-        query_result = execute_query(query=query, args=(genre,))
-    else:
+    if not genre:
         return jsonify({"error": "Please provide a genre name."}), 400
 
-    response_data = []
+    return jsonify(genre_popularity.top_cities(genre))
+
 
-    for row in query_result:
-        city = row[0]
-        genre_name = row[1] if len(row) > 1 else None
-        purchase_count = row[2] if len(row) > 2 else None
+@app.route('/popular_genres_by_city/all')
+@use_kwargs({'top': fields.Int(load_default=1, validate=validate.Range(min=1))}, location='query')
+def get_popular_cities_for_all_genres(top):
+    """
+    Endpoint to find the most popular cities of every music genre at once.
 
-        response_data.append({
-            'city': city,
-            'genre': genre_name,
-            'purchase_count': purchase_count
-        })
+    Args:
+        top (int): How many of the highest purchase counts to include per genre.
+                   Cities with equal counts share a place, so `top=1` returns the
+                   same cities as /popular_genres_by_city for each genre.
 
-    return jsonify(response_data)
+    Returns:
+        JSON object mapping every genre name to a list of cities in the same format
+        as /popular_genres_by_city.
+    """
+    return jsonify(genre_popularity.top_cities_by_genre(top))
 
 
 if __name__ == '__main__':
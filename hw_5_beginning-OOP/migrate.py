@@ -0,0 +1,20 @@
+"""
+Prepare chinook.db for the app: switch it to write-ahead logging and create
+the covering indexes of the genre popularity queries.
+
+Importing the app never changes the database file, so run this once before
+starting it, from this directory with `PYTHONPATH=.. python migrate.py`.
+Running it again changes nothing.
+"""
+from database_handler import database
+from genre_popularity import install_covering_indexes
+
+
+def migrate():
+    database.enable_wal()
+    install_covering_indexes()
+
+
+if __name__ == '__main__':
+    migrate()
+    print(f'Migrated {database.path}')
@@ -1,5 +1,12 @@
 import math
 
+import numpy as np
+
+
+# Points are processed in blocks so that the temporary distance arrays of a
+# block stay around CHUNK_ELEMENTS floats however many points are passed in.
+CHUNK_ELEMENTS = 1 << 22
+
 
 class Point:
     """
@@ -35,13 +42,96 @@ class Circle:
         distance = math.sqrt((self.x - point.x)**2 + (self.y - point.y)**2)
         return distance <= self.radius
 
+    def contains_points(self, points, chunk_size=CHUNK_ELEMENTS):
+        """
+        Test many points at once.
+
+        Args:
+            points (array-like): An (N, 2) array of X and Y coordinates.
+            chunk_size (int): The number of points processed per block.
+
+        Returns:
+            numpy.ndarray: A boolean mask of length N, True where the point is inside the circle.
+        """
+        points = as_points_array(points)
+        mask = np.empty(len(points), dtype=bool)
+        radius_squared = self.radius * self.radius
+        for start in range(0, len(points), chunk_size):
+            block = points[start:start + chunk_size]
+            dx = block[:, 0] - self.x
+            dy = block[:, 1] - self.y
+            np.less_equal(dx * dx + dy * dy, radius_squared, out=mask[start:start + chunk_size])
+        return mask
+
     def __str__(self):
         return f'Circle: ({self.x}, {self.y}, {self.radius})'
 
 
-circle = Circle(0, 0, 5)
-point_inside = Point(3, 4)
-point_outside = Point(6, 8)
+def as_points_array(points):
+    """Return `points`, an (N, 2) array-like or a sequence of Point objects, as an (N, 2) float array."""
+    if len(points) and isinstance(points[0], Point):
+        return np.array([(point.x, point.y) for point in points], dtype=np.float64)
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def as_circles_array(circles):
+    """Return `circles`, an (M, 3) array-like or a sequence of Circle objects, as an (M, 3) float array."""
+    if len(circles) and isinstance(circles[0], Circle):
+        return np.array([(circle.x, circle.y, circle.radius) for circle in circles], dtype=np.float64)
+    return np.asarray(circles, dtype=np.float64).reshape(-1, 3)
+
+
+def circles_contain(points, circles, first_hit=False, chunk_elements=CHUNK_ELEMENTS):
+    """
+    Test every point against every circle.
+
+    Squared distances are compared with squared radii, so no square root is
+    taken. Points go through in blocks of about `chunk_elements / M` points,
+    which bounds the temporary arrays however many points are passed in.
+
+    Args:
+        points (array-like): An (N, 2) array of X and Y coordinates, or Point objects.
+        circles (array-like): An (M, 3) array of center X, center Y and radius, or Circle objects.
+        first_hit (bool): Return the index of the first containing circle instead of the full matrix.
+        chunk_elements (int): The number of point-circle pairs processed per block.
+
+    Returns:
+        numpy.ndarray: An (N, M) boolean matrix, True where circle j contains point i,
+        or with `first_hit` an array of N circle indexes, -1 where no circle contains the point.
+    """
+    points = as_points_array(points)
+    circles = as_circles_array(circles)
+    centers_x, centers_y, radii = circles[:, 0], circles[:, 1], circles[:, 2]
+    radii_squared = radii * radii
+    block_size = max(1, chunk_elements // max(len(circles), 1))
+
+    if first_hit:
+        result = np.full(len(points), -1, dtype=np.intp)
+    else:
+        result = np.empty((len(points), len(circles)), dtype=bool)
+    if not len(circles):
+        return result
+
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        dx = block[:, 0, None] - centers_x
+        dy = block[:, 1, None] - centers_y
+        dx *= dx
+        dy *= dy
+        dx += dy
+        inside = dx <= radii_squared
+        if first_hit:
+            hits = inside.argmax(axis=1)
+            result[start:start + block_size] = np.where(inside[np.arange(len(block)), hits], hits, -1)
+        else:
+            result[start:start + block_size] = inside
+    return result
+
+
+if __name__ == '__main__':
+    circle = Circle(0, 0, 5)
+    point_inside = Point(3, 4)
+    point_outside = Point(6, 8)
 
-print(circle.contains(point_inside))
-print(circle.contains(point_outside))
+    print(circle.contains(point_inside))
+    print(circle.contains(point_outside))
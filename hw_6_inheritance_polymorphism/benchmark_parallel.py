@@ -0,0 +1,44 @@
+"""
+Measure how `Scene.recompute_total` scales with the number of worker threads, and how exact its total is.
+
+Every worker count recomputes the areas of the same scene. The totals are
+compared with `math.fsum` over all areas, which is correctly rounded, and
+with adding the areas one after another. The areas are computed by the
+shape classes from the columns the scene was built from, so the scene is
+only used through its public methods.
+
+Run from this directory with `python benchmark_parallel.py [figures] [workers ...]`.
+"""
+import math
+import os
+import sys
+
+import numpy as np
+
+from benchmark_scene import random_columns, timed
+from main import Scene
+
+
+if __name__ == '__main__':
+    figures = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000_000
+    cores = os.cpu_count() or 1
+    worker_counts = [int(value) for value in sys.argv[2:]] or sorted({1, 2, cores} | {w for w in (4, 8) if w <= cores})
+
+    scene = Scene()
+    areas = []
+    for shape_type, shape_columns in random_columns(np.random.default_rng(0), figures // 4).items():
+        scene.add_columns(shape_type, **shape_columns)
+        areas.append(shape_type._squares(shape_columns))
+    areas = np.concatenate(areas)
+    exact = math.fsum(areas)
+    sequential = float(np.cumsum(areas)[-1])
+
+    print(f'{len(scene):,} figures, {cores} cores')
+    base_time = None
+    for workers in worker_counts:
+        scene.workers = workers
+        total, elapsed = timed(scene.recompute_total)
+        base_time = base_time or elapsed
+        print(f'workers {workers:>3}   {elapsed:7.3f} s   {base_time / elapsed:5.2f}x   '
+              f'relative error {abs(total - exact) / exact:.1e}')
+    print(f'adding one by one: relative error {abs(sequential - exact) / exact:.1e}')
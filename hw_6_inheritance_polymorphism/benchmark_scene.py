@@ -0,0 +1,82 @@
+"""
+Compare a Scene against a plain list of shape objects: memory, build time and total area time.
+
+The scene computes areas while its figures are added and keeps a running
+total, so the time of `total_square` does not grow with the scene.
+
+Run from this directory with `python benchmark_scene.py [figures]`.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from main import Circle, Parallelogram, Rectangle, Scene, Triangle
+
+
+def random_columns(rng, count):
+    """Return valid constructor arguments for `count` figures of every shape class."""
+    x, y = rng.uniform(-1000, 1000, size=(2, count))
+    sides = rng.uniform(1, 10, size=(3, count))
+    sides[2] = np.minimum(sides[2], sides[0] + sides[1] - 0.01)
+    sides[2] = np.maximum(sides[2], np.abs(sides[0] - sides[1]) + 0.01)
+    return {
+        Circle: {'x': x, 'y': y, 'radius': rng.uniform(1, 10, count)},
+        Rectangle: {'x': x, 'y': y, 'height': rng.uniform(1, 10, count), 'width': rng.uniform(1, 10, count)},
+        Parallelogram: {
+            'x': x, 'y': y, 'height': rng.uniform(1, 10, count), 'width': rng.uniform(1, 10, count),
+            'angle': rng.uniform(1, 179, count),
+        },
+        Triangle: {'x': x, 'y': y, 'a': sides[0], 'b': sides[1], 'c': sides[2]},
+    }
+
+
+def measure(build):
+    """Return the object built by `build` and the bytes it allocated."""
+    tracemalloc.start()
+    built = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, size
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+if __name__ == '__main__':
+    figures = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = random_columns(np.random.default_rng(0), figures // 4)
+
+    def build_objects():
+        return [
+            shape_type(*values)
+            for shape_type, shape_columns in columns.items()
+            for values in zip(*(shape_columns[name].tolist() for name in shape_type._fields))
+        ]
+
+    def build_scene():
+        scene = Scene()
+        for shape_type, shape_columns in columns.items():
+            scene.add_columns(shape_type, **shape_columns)
+        return scene
+
+    objects, objects_bytes = measure(build_objects)
+    scene, scene_bytes = measure(build_scene)
+    _, objects_build_time = timed(build_objects, repeat=1)
+    _, scene_build_time = timed(build_scene, repeat=1)
+    objects_total, objects_time = timed(lambda: sum(figure.square() for figure in objects))
+    scene_total, scene_time = timed(scene.total_square)
+
+    print(f'{len(objects):,} figures')
+    print(f'memory        objects {objects_bytes / 2**20:8.1f} MiB   scene {scene_bytes / 2**20:8.1f} MiB')
+    print(f'build         objects {objects_build_time:8.3f} s     scene {scene_build_time:8.3f} s')
+    print(f'total_square  objects {objects_time:8.3f} s     scene {scene_time:8.3f} s   '
+          f'{objects_time / scene_time:.0f}x faster')
+    print(f'relative difference of the totals: {abs(scene_total - objects_total) / objects_total:.1e}')
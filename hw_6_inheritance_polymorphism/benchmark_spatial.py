@@ -0,0 +1,72 @@
+"""
+Compare the spatial queries of a Scene against vectorized scans over all its figures.
+
+The scene is only used through its public methods. The scans run the
+vectorized shape classmethods on the columns the scene was built from.
+
+Run from this directory with `python benchmark_spatial.py [figures]`.
+"""
+import sys
+
+import numpy as np
+
+from benchmark_scene import random_columns, timed
+from main import Scene
+
+QUERIES = 200
+
+
+def scan_at(batches, x, y):
+    """Return the numbers of the figures that contain a point, checking every figure."""
+    return sorted(
+        number
+        for shape_type, numbers, columns in batches
+        for number in numbers[shape_type._contains(columns, x, y)].tolist()
+    )
+
+
+def scan_nearest(batches, x, y):
+    """Return the number of the figure closest to a point, measuring to every figure."""
+    nearest = None
+    for shape_type, numbers, columns in batches:
+        distances = shape_type._distances(columns, x, y)
+        position = int(np.argmin(distances))
+        if nearest is None or distances[position] < nearest[0]:
+            nearest = (distances[position], int(numbers[position]))
+    return nearest[1]
+
+
+def per_query(func, points):
+    _, elapsed = timed(lambda: [func(x, y) for x, y in points], repeat=1)
+    return elapsed / len(points)
+
+
+if __name__ == '__main__':
+    figures = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    scene = Scene()
+    batches = [
+        (shape_type, np.array(scene.add_columns(shape_type, **shape_columns)), shape_columns)
+        for shape_type, shape_columns in random_columns(rng, figures // 4).items()
+    ]
+    points = rng.uniform(-1000, 1000, size=(QUERIES, 2)).tolist()
+
+    # The first query builds the index.
+    _, build_time = timed(lambda: scene.figures_in((0, 0, 0, 0)), repeat=1)
+    for x, y in points[:20]:
+        assert scene.figures_at((x, y)) == scan_at(batches, x, y)
+        assert scene.nearest((x, y))[0][0] == scan_nearest(batches, x, y)
+
+    print(f'{len(scene):,} figures, index built by the first query in {build_time:.2f} s')
+    for name, indexed, scanned in (
+        ('figures_at', lambda x, y: scene.figures_at((x, y)), lambda x, y: scan_at(batches, x, y)),
+        ('nearest', lambda x, y: scene.nearest((x, y)), lambda x, y: scan_nearest(batches, x, y)),
+    ):
+        indexed_time = per_query(indexed, points)
+        scanned_time = per_query(scanned, points[:20])
+        print(f'{name:<12} index {indexed_time * 1e6:9.1f} us   scan {scanned_time * 1e6:9.1f} us   '
+              f'{scanned_time / indexed_time:.0f}x faster')
+
+    _, add_time = timed(lambda: scene.add_columns(
+        type(scene[0]), **random_columns(rng, 1000)[type(scene[0])]), repeat=1)
+    print(f'adding 1,000 figures to the built index: {add_time * 1e3:.1f} ms')
@@ -1,8 +1,75 @@
+import functools
+import heapq
+import itertools
 import math
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# Rows per piece of work when the areas of many figures are computed at once.
+SHARD_SIZE = 1 << 20
+
+
+class _Dimension:
+    """
+    A shape attribute kept in a private slot.
+
+    Assigning it drops the values the shape has cached. On a figure added to
+    or read from a Scene, it also changes the figure in the scene.
+    """
+
+    __slots__ = ('name', 'slot')
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = f'_{name}'
+
+    def __get__(self, shape, owner=None):
+        if shape is None:
+            return self
+        return getattr(shape, self.slot)
+
+    def __set__(self, shape, value):
+        if shape._owner is not None:
+            scene, number = shape._owner
+            scene.update_figure(number, **{self.name: value})
+        setattr(shape, self.slot, value)
+        shape._cache = None
+
+
+def _cached(method):
+    """Cache the result of a shape method until one of the shape's dimensions is assigned."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        if name not in cache:
+            cache[name] = method(self)
+        return cache[name]
+
+    return wrapper
 
 
 class Shape:
-    """Base class for shapes with coordinates (x, y)."""
+    """
+    Base class for shapes with coordinates (x, y).
+
+    Every shape class lists its constructor arguments in `_fields`, which is
+    also the order of its columns in a Scene, and computes the areas of many
+    shapes of its kind at once in `_squares`. Derived values such as the area
+    are cached until a dimension is assigned.
+    """
+
+    __slots__ = ('_x', '_y', '_cache', '_owner', '__weakref__')
+    _fields = ('x', 'y')
+
+    x = _Dimension()
+    y = _Dimension()
 
     def __init__(self, x, y):
         """
@@ -11,6 +78,8 @@ class Shape:
         :param x: X-coordinate of the shape
         :param y: Y-coordinate of the shape
         """
+        self._cache = None
+        self._owner = None
         self.x = x
         self.y = y
 
@@ -21,15 +90,111 @@ class Shape:
         """
         return 0
 
+    def perimeter(self):
+        """
+        Return the perimeter of the shape. To be overridden by subclasses.
+        :return: Perimeter of the shape (default is 0)
+        """
+        return 0
+
+    def _invalidate(self):
+        """Drop the cached derived values, after attributes were changed without a `_Dimension`."""
+        self._cache = None
+
+    @classmethod
+    def _squares(cls, columns):
+        """
+        Return the areas of many shapes of this class.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :return: Array of areas
+        """
+        return np.zeros(len(columns['x']))
+
+    @classmethod
+    def _validate_columns(cls, columns):
+        """
+        Check many shapes of this class at once, like `__init__` checks one.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :raise ValueError: If any shape is invalid
+        """
+
+    @_cached
+    def bbox(self):
+        """
+        Return the bounding box of the shape.
+        :return: Tuple of min x, min y, max x and max y
+        """
+        return tuple(type(self)._bboxes(self._columns())[:, 0].tolist())
+
+    def _columns(self):
+        """
+        :return: The shape as columns of one element, for the classmethods that take many shapes
+        """
+        return {name: np.array([getattr(self, name)], dtype=np.float64) for name in type(self)._fields}
+
+    @classmethod
+    def _bboxes(cls, columns):
+        """
+        Return the bounding boxes of many shapes of this class.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :return: Array of 4 rows: min x, min y, max x and max y
+        """
+        return np.stack([columns['x'], columns['y'], columns['x'], columns['y']])
+
+    @classmethod
+    def _contains(cls, columns, x, y):
+        """
+        Check which of many shapes of this class contain a point, their boundaries included.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :param x: X-coordinate of the point
+        :param y: Y-coordinate of the point
+        :return: Boolean array
+        """
+        return (columns['x'] == x) & (columns['y'] == y)
+
+    @classmethod
+    def _distances(cls, columns, x, y):
+        """
+        Return the distances from a point to many shapes of this class, 0 for shapes containing it.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :param x: X-coordinate of the point
+        :param y: Y-coordinate of the point
+        :return: Array of distances
+        """
+        return np.hypot(columns['x'] - x, columns['y'] - y)
+
+    @classmethod
+    def _from_values(cls, values, owner=None):
+        """
+        Create a shape from its `_fields` values without checking them again.
+        :param values: Values in the order of `_fields`
+        :param owner: Tuple of the Scene and the number of the figure the shape shows, or None
+        :return: Shape object
+        """
+        shape = cls.__new__(cls)
+        shape._cache = None
+        shape._owner = None
+        for name, value in zip(cls._fields, values):
+            setattr(shape, name, value)
+        shape._owner = owner
+        return shape
+
 
 class Point(Shape):
     """A class representing a point in the 2D space."""
-    pass
+
+    __slots__ = ()
+    _fields = ('x', 'y')
 
 
 class Circle(Shape):
     """A class representing a circle."""
 
+    __slots__ = ('_radius',)
+    _fields = ('x', 'y', 'radius')
+
+    radius = _Dimension()
+
     def __init__(self, x, y, radius):
         """
         Initialize a circle with center coordinates and a radius.
@@ -44,6 +209,7 @@ class Circle(Shape):
             raise ValueError('Radius must be a positive number.')
         self.radius = radius
 
+    @_cached
     def square(self):
         """
         Calculate and return the area of the circle.
@@ -51,6 +217,36 @@ class Circle(Shape):
         """
         return math.pi * self.radius ** 2
 
+    @_cached
+    def perimeter(self):
+        """
+        Calculate and return the circumference of the circle.
+        :return: Circumference of the circle
+        """
+        return 2 * math.pi * self.radius
+
+    @classmethod
+    def _squares(cls, columns):
+        return math.pi * np.float_power(columns['radius'], 2)
+
+    @classmethod
+    def _validate_columns(cls, columns):
+        if np.any(columns['radius'] <= 0):
+            raise ValueError('Radius must be a positive number.')
+
+    @classmethod
+    def _bboxes(cls, columns):
+        x, y, radius = columns['x'], columns['y'], columns['radius']
+        return np.stack([x - radius, y - radius, x + radius, y + radius])
+
+    @classmethod
+    def _contains(cls, columns, x, y):
+        return (columns['x'] - x) ** 2 + (columns['y'] - y) ** 2 <= columns['radius'] ** 2
+
+    @classmethod
+    def _distances(cls, columns, x, y):
+        return np.maximum(np.hypot(columns['x'] - x, columns['y'] - y) - columns['radius'], 0)
+
     def __contains__(self, other):
         """
         Check if a point lies within the circle.
@@ -66,8 +262,73 @@ class Circle(Shape):
         return f'Circle(x={self.x}, y={self.y}, radius={self.radius})'
 
 
-class Rectangle(Shape):
-    """A class representing a rectangle."""
+class _ConvexPolygon(Shape):
+    """
+    Base class for shapes that are convex polygons.
+
+    Subclasses give their vertices in `_vertices`, in order around the
+    polygon with the interior on the left, and get bounding boxes, point
+    containment and distances from them.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _vertices(cls, columns):
+        """
+        Return the vertices of many shapes of this class.
+        :param columns: Dict of equally long arrays, one per name in `_fields`
+        :return: Array of shape (vertices, 2, shapes) with the x and y of every vertex
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def _bboxes(cls, columns):
+        vertices = cls._vertices(columns)
+        return np.concatenate([vertices.min(axis=0), vertices.max(axis=0)])
+
+    @classmethod
+    def _contains(cls, columns, x, y):
+        vertices = cls._vertices(columns)
+        edges = np.roll(vertices, -1, axis=0) - vertices
+        # The z of the cross product of each edge and the vector from its start to the point.
+        sides = edges[:, 0] * (y - vertices[:, 1]) - edges[:, 1] * (x - vertices[:, 0])
+        return np.all(sides >= 0, axis=0)
+
+    @classmethod
+    def _distances(cls, columns, x, y):
+        vertices = cls._vertices(columns)
+        edges = np.roll(vertices, -1, axis=0) - vertices
+        dx, dy = x - vertices[:, 0], y - vertices[:, 1]
+        lengths_squared = edges[:, 0] ** 2 + edges[:, 1] ** 2
+        along = np.clip((dx * edges[:, 0] + dy * edges[:, 1]) / lengths_squared, 0, 1)
+        distances = np.hypot(dx - along * edges[:, 0], dy - along * edges[:, 1]).min(axis=0)
+        return np.where(cls._contains(columns, x, y), 0.0, distances)
+
+    def __contains__(self, other):
+        """
+        Check if a point lies within the shape, its boundary included.
+        :param other: Point object to check
+        :return: True if point lies inside the shape, False otherwise
+        :raise ValueError: If other is not a Point
+        """
+        if not isinstance(other, Point):
+            raise ValueError('This operation is available only for Point')
+        return bool(type(self)._contains(self._columns(), other.x, other.y)[0])
+
+
+class Rectangle(_ConvexPolygon):
+    """
+    A class representing a rectangle.
+
+    Its sides are parallel to the axes: width along x and height along y.
+    """
+
+    __slots__ = ('_height', '_width')
+    _fields = ('x', 'y', 'height', 'width')
+
+    height = _Dimension()
+    width = _Dimension()
 
     def __init__(self, x, y, height, width):
         """
@@ -85,6 +346,7 @@ class Rectangle(Shape):
         self.height = height
         self.width = width
 
+    @_cached
     def square(self):
         """
         Calculate and return the area of the rectangle.
@@ -92,12 +354,44 @@ class Rectangle(Shape):
         """
         return self.width * self.height
 
+    @_cached
+    def perimeter(self):
+        """
+        Calculate and return the perimeter of the rectangle.
+        :return: Perimeter of the rectangle
+        """
+        return 2 * (self.width + self.height)
+
+    @classmethod
+    def _squares(cls, columns):
+        return columns['width'] * columns['height']
+
+    @classmethod
+    def _validate_columns(cls, columns):
+        if np.any(columns['height'] <= 0) or np.any(columns['width'] <= 0):
+            raise ValueError('Height and width must be positive numbers.')
+
+    @classmethod
+    def _vertices(cls, columns):
+        x, y, height, width = columns['x'], columns['y'], columns['height'], columns['width']
+        return np.array([[x, y], [x + width, y], [x + width, y + height], [x, y + height]])
+
     def __repr__(self):
         return f'Rectangle(x={self.x}, y={self.y}, height={self.height}, width={self.width})'
 
 
 class Parallelogram(Rectangle):
-    """A class representing a parallelogram."""
+    """
+    A class representing a parallelogram.
+
+    Its base of length width runs along x from (x, y), and its sides of
+    length height make `angle` with the base, towards larger y.
+    """
+
+    __slots__ = ('_angle',)
+    _fields = ('x', 'y', 'height', 'width', 'angle')
+
+    angle = _Dimension()
 
     def __init__(self, x, y, height, width, angle):
         """
@@ -115,6 +409,7 @@ class Parallelogram(Rectangle):
             raise ValueError('Angle must be between 0 and 180 degrees (non-inclusive).')
         self.angle = angle
 
+    @_cached
     def square(self):
         """
         Calculate and return the area of the parallelogram.
@@ -122,12 +417,41 @@ class Parallelogram(Rectangle):
         """
         return self.height * math.sin(math.radians(self.angle)) * self.width
 
+    @classmethod
+    def _squares(cls, columns):
+        return columns['height'] * np.sin(np.radians(columns['angle'])) * columns['width']
+
+    @classmethod
+    def _validate_columns(cls, columns):
+        super()._validate_columns(columns)
+        if np.any(columns['angle'] <= 0) or np.any(columns['angle'] >= 180):
+            raise ValueError('Angle must be between 0 and 180 degrees (non-inclusive).')
+
+    @classmethod
+    def _vertices(cls, columns):
+        x, y, height, width = columns['x'], columns['y'], columns['height'], columns['width']
+        angle = np.radians(columns['angle'])
+        side_x, side_y = height * np.cos(angle), height * np.sin(angle)
+        return np.array([[x, y], [x + width, y], [x + width + side_x, y + side_y], [x + side_x, y + side_y]])
+
     def __str__(self):
         return f'Parallelogram: width={self.width}, height={self.height}, angle={self.angle}'
 
 
-class Triangle(Shape):
-    """A class representing a triangle."""
+class Triangle(_ConvexPolygon):
+    """
+    A class representing a triangle.
+
+    Its side c runs along x from (x, y), and the vertex opposite to it lies
+    towards larger y, at distance b from (x, y) and a from the other end of c.
+    """
+
+    __slots__ = ('_a', '_b', '_c')
+    _fields = ('x', 'y', 'a', 'b', 'c')
+
+    a = _Dimension()
+    b = _Dimension()
+    c = _Dimension()
 
     def __init__(self, x, y, a, b, c):
         """
@@ -150,6 +474,7 @@ class Triangle(Shape):
         self.b = b
         self.c = c
 
+    @_cached
     def perimeter(self):
         """
         Calculate and return the perimeter of the triangle.
@@ -165,56 +490,951 @@ class Triangle(Shape):
         """
         return self.perimeter() / 2
 
+    @_cached
     def square(self):
         """
         Calculate and return the area of the triangle using Heron's formula.
         :return: Area of the triangle
         """
+        semi_perimeter = self.semi_perimeter
         return math.sqrt(
-            self.semi_perimeter *
-            (self.semi_perimeter - self.a) *
-            (self.semi_perimeter - self.b) *
-            (self.semi_perimeter - self.c)
+            semi_perimeter *
+            (semi_perimeter - self.a) *
+            (semi_perimeter - self.b) *
+            (semi_perimeter - self.c)
         )
 
+    @classmethod
+    def _squares(cls, columns):
+        a, b, c = columns['a'], columns['b'], columns['c']
+        semi_perimeter = (a + b + c) / 2
+        return np.sqrt(semi_perimeter * (semi_perimeter - a) * (semi_perimeter - b) * (semi_perimeter - c))
+
+    @classmethod
+    def _validate_columns(cls, columns):
+        a, b, c = columns['a'], columns['b'], columns['c']
+        if np.any(a <= 0) or np.any(b <= 0) or np.any(c <= 0):
+            raise ValueError('Sides must be positive.')
+        if np.any(a + b <= c) or np.any(a + c <= b) or np.any(b + c <= a):
+            raise ValueError(
+                'The sum of the lengths of any two sides must be greater than the length of the third side.')
+
+    @classmethod
+    def _vertices(cls, columns):
+        x, y, a, b, c = columns['x'], columns['y'], columns['a'], columns['b'], columns['c']
+        apex_x = (b ** 2 + c ** 2 - a ** 2) / (2 * c)
+        apex_y = np.sqrt(np.maximum(b ** 2 - apex_x ** 2, 0))
+        return np.array([[x, y], [x + c, y], [x + apex_x, y + apex_y]])
+
     def __repr__(self):
         return f'Triangle(x={self.x}, y={self.y}, a={self.a}, b={self.b}, c={self.c})'
 
 
-class Scene:
-    """A class representing a collection of shapes."""
+class _GrowableArray:
+    """A NumPy array with amortized O(1) appends, doubling its capacity when full."""
+
+    __slots__ = ('data', 'size')
+
+    def __init__(self, rows, dtype=np.float64, capacity=16):
+        """
+        :param rows: Number of rows, or None for a one-dimensional array
+        :param dtype: NumPy dtype of the items
+        :param capacity: Number of items allocated up front
+        """
+        shape = (capacity,) if rows is None else (rows, capacity)
+        self.data = np.empty(shape, dtype=dtype)
+        self.size = 0
+
+    def reserve(self, count):
+        """
+        Make room for `count` more items.
+        :param count: Number of items about to be added
+        """
+        needed = self.size + count
+        capacity = self.data.shape[-1]
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            data = np.empty(self.data.shape[:-1] + (capacity,), dtype=self.data.dtype)
+            data[..., :self.size] = self.data[..., :self.size]
+            self.data = data
+
+    def append(self, value):
+        """
+        Append one item and return its index.
+        :param value: A scalar, or a sequence with one value per row
+        :return: Index of the item
+        """
+        self.reserve(1)
+        self.data[..., self.size] = value
+        self.size += 1
+        return self.size - 1
+
+    def extend(self, values):
+        """
+        Append several items and return the index of the first one.
+        :param values: An array whose last axis runs over the new items
+        :return: Index of the first new item
+        """
+        values = np.asarray(values)
+        count = values.shape[-1]
+        self.reserve(count)
+        self.data[..., self.size:self.size + count] = values
+        self.size += count
+        return self.size - count
+
+    def view(self):
+        """
+        :return: The filled part of the array, without copying it
+        """
+        return self.data[..., :self.size]
+
+
+class _CompensatedSum:
+    """A running float sum with Neumaier compensation, so that many additions and subtractions do not drift."""
+
+    __slots__ = ('sum', 'compensation')
 
     def __init__(self):
-        """Initialize an empty scene."""
-        self._figures = []
+        self.sum = 0.0
+        self.compensation = 0.0
+
+    def add(self, value):
+        """
+        Add a value, negative to subtract it.
+        :param value: Float to add
+        """
+        total = self.sum + value
+        if abs(self.sum) >= abs(value):
+            self.compensation += (self.sum - total) + value
+        else:
+            self.compensation += (value - total) + self.sum
+        self.sum = total
+
+    def value(self):
+        """
+        :return: The compensated sum
+        """
+        return self.sum + self.compensation
+
+
+def _sharded_squares(shape_type, columns, out, workers=1):
+    """
+    Compute the areas of many shapes of one class in shards of `SHARD_SIZE` rows.
+
+    Shards are computed by `workers` threads at once: NumPy releases the GIL
+    in the arithmetic on large arrays, so the threads run on separate cores.
+    Each shard is summed pairwise by NumPy and the partial sums are added
+    with `math.fsum`, so the error of the total does not grow with the
+    number of shards.
+
+    :param shape_type: Shape class of the figures
+    :param columns: Dict of equally long arrays, one per name in `shape_type._fields`
+    :param out: Array to write the areas into, as long as the columns
+    :param workers: Number of threads
+    :return: Sum of the areas
+    """
+    def compute(start):
+        stop = start + SHARD_SIZE
+        out[start:stop] = shape_type._squares({name: values[start:stop] for name, values in columns.items()})
+        return float(np.sum(out[start:stop]))
+
+    starts = range(0, len(out), SHARD_SIZE)
+    if workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(min(workers, len(starts))) as executor:
+            return math.fsum(executor.map(compute, starts))
+    return math.fsum(map(compute, starts))
+
+
+def _integral_mask(values):
+    """
+    :param values: Values of the dimensions of a figure
+    :return: Bit mask with the bit of every position that holds an integer
+    """
+    return sum(1 << position for position, value in enumerate(values) if isinstance(value, (int, np.integer)))
+
+
+class _ColumnStore:
+    """
+    The figures of one shape class, as one contiguous float64 column per `_fields` name.
+
+    Rows are kept dense: removing a figure moves the last row into its place,
+    and `numbers` tells which figure of the scene each row holds. `integral`
+    keeps a bit mask per row of the dimensions that were given as integers,
+    so they read back as integers.
+    """
+
+    __slots__ = ('shape_type', 'values', 'integral', 'numbers')
+
+    def __init__(self, shape_type):
+        self.shape_type = shape_type
+        self.values = _GrowableArray(len(shape_type._fields))
+        self.integral = _GrowableArray(None, dtype=np.uint8)
+        self.numbers = _GrowableArray(None, dtype=np.int64)
+
+    def __len__(self):
+        return self.values.size
+
+    def append(self, figure, number):
+        values = [getattr(figure, name) for name in self.shape_type._fields]
+        self.numbers.append(number)
+        self.integral.append(_integral_mask(values))
+        return self.values.append(values)
+
+    def extend(self, columns, numbers, integral=0):
+        """
+        :param columns: Dict of equally long float64 arrays, one per name in `_fields`
+        :param numbers: Array of the numbers of the figures in the scene
+        :param integral: Bit mask of the columns that were given as integers
+        :return: Row of the first new figure
+        """
+        self.numbers.extend(numbers)
+        self.integral.extend(np.full(len(numbers), integral, dtype=np.uint8))
+        return self.values.extend([columns[name] for name in self.shape_type._fields])
+
+    def _values(self, row):
+        """
+        :param row: Row of the figure
+        :return: List of the dimensions of the figure in the order of `_fields`, with their original types
+        """
+        values = self.values.data[:, row].tolist()
+        mask = int(self.integral.data[row])
+        if mask:
+            values = [int(value) if mask >> position & 1 else value for position, value in enumerate(values)]
+        return values
+
+    def get(self, row, owner=None):
+        return self.shape_type._from_values(self._values(row), owner)
+
+    def update(self, row, changes):
+        """
+        Change dimensions of the figure in `row`, checking them like the constructor does.
+        :param row: Row of the figure
+        :param changes: New values by name in `_fields`
+        :return: New area of the figure
+        :raise ValueError: If a name is not a dimension of the class or the figure would be invalid
+        """
+        fields = self.shape_type._fields
+        unknown = set(changes).difference(fields)
+        if unknown:
+            raise ValueError(f'{self.shape_type.__name__} has no dimensions {", ".join(sorted(unknown))}.')
+        values = dict(zip(fields, self._values(row)))
+        values.update(changes)
+        figure = self.shape_type(**values)
+        values = [getattr(figure, name) for name in fields]
+        self.values.data[:, row] = values
+        self.integral.data[row] = _integral_mask(values)
+        return figure.square()
+
+    def remove(self, row):
+        """
+        Remove the figure in `row` by moving the last row into its place.
+        :param row: Row of the figure
+        :return: Number of the figure moved into `row`, or None if it was the last row
+        """
+        last = self.values.size - 1
+        moved = None
+        if row != last:
+            self.values.data[:, row] = self.values.data[:, last]
+            self.integral.data[row] = self.integral.data[last]
+            self.numbers.data[row] = moved = int(self.numbers.data[last])
+        self.values.size -= 1
+        self.integral.size -= 1
+        self.numbers.size -= 1
+        return moved
+
+    def all_numbers(self):
+        return self.numbers.view()
+
+    def call(self, method, rows, *args):
+        """
+        Call a classmethod that takes columns, such as `_bboxes`, on the figures in `rows`.
+        :param method: Name of the classmethod
+        :param rows: Array of rows
+        :param args: Further arguments of the classmethod
+        :return: What the classmethod returns
+        """
+        return getattr(self.shape_type, method)(dict(zip(self.shape_type._fields, self.values.data[:, rows])), *args)
+
+    def columns(self):
+        return dict(zip(self.shape_type._fields, self.values.view()))
+
+    def squares(self):
+        return self.shape_type._squares(self.columns())
+
+
+class _ObjectStore:
+    """
+    The figures of a shape class without columns, kept as the objects themselves.
+
+    The objects belong to the scene: assigning their dimensions updates it.
+    """
+
+    __slots__ = ('shape_type', 'figures', 'numbers')
+
+    def __init__(self, shape_type):
+        self.shape_type = shape_type
+        self.figures = []
+        self.numbers = []
+
+    def __len__(self):
+        return len(self.figures)
+
+    def append(self, figure, number):
+        self.figures.append(figure)
+        self.numbers.append(number)
+        return len(self.figures) - 1
+
+    def get(self, row, owner=None):
+        return self.figures[row]
+
+    def update(self, row, changes):
+        """
+        Assign dimensions of the figure in `row`.
+        :param row: Row of the figure
+        :param changes: New values by attribute name
+        :return: New area of the figure
+        :raise ValueError: If a name is not an attribute of the figure
+        """
+        figure = self.figures[row]
+        for name in changes:
+            if not hasattr(figure, name):
+                raise ValueError(f'{self.shape_type.__name__} has no dimension {name}.')
+        owner, figure._owner = figure._owner, None
+        try:
+            for name, value in changes.items():
+                setattr(figure, name, value)
+        finally:
+            figure._owner = owner
+        figure._invalidate()
+        return figure.square()
+
+    def remove(self, row):
+        """
+        Remove the figure in `row` by moving the last figure into its place.
+        :param row: Row of the figure
+        :return: Number of the figure moved into `row`, or None if it was the last row
+        """
+        self.figures[row]._owner = None
+        last_figure, last_number = self.figures.pop(), self.numbers.pop()
+        if row == len(self.figures):
+            return None
+        self.figures[row], self.numbers[row] = last_figure, last_number
+        return last_number
+
+    def all_numbers(self):
+        return np.array(self.numbers, dtype=np.int64)
+
+    def call(self, method, rows, *args):
+        """
+        Call a classmethod that takes columns, such as `_bboxes`, on the figures in `rows`, one figure at a time.
+        :param method: Name of the classmethod
+        :param rows: Array of rows
+        :param args: Further arguments of the classmethod
+        :return: Results of the figures, joined along the last axis
+        """
+        results = [getattr(type(figure), method)(figure._columns(), *args) for figure in map(self.figures.__getitem__, rows)]
+        return np.concatenate(results, axis=-1) if results else np.empty(0)
+
+    def squares(self):
+        return np.array([figure.square() for figure in self.figures], dtype=np.float64)
+
+
+class _GridIndex:
+    """
+    A uniform grid over the bounding boxes of the figures of a scene.
+
+    Every figure is listed in each square cell of side `cell_size` its
+    bounding box overlaps, so the figures near a point are found by looking
+    at a few cells. Figures that would span more than `MAX_CELLS_PER_FIGURE`
+    cells are kept aside in `large` and checked by every query instead.
+    """
+
+    MAX_CELLS_PER_FIGURE = 64
+    MAX_CELL_INDEX = 2 ** 61
+
+    __slots__ = ('cell_size', 'cells', 'large', 'bboxes', 'extent')
+
+    def __init__(self, cell_size):
+        """
+        :param cell_size: Side of a cell
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.large = set()
+        self.bboxes = _GrowableArray(4)
+        self.extent = None
+
+    @staticmethod
+    def _key(i, j):
+        """
+        Return the dict key of the cell in column `i` and row `j`.
+
+        Keys of NumPy int64 arrays wrap around past 64 bits, and keys of Python
+        ints are wrapped the same way, so both give one key for one cell. Cells
+        more than 2 ** 31 apart may share a key, which only adds candidates that
+        the queries filter by bounding box.
+
+        :param i: Column as a Python int or an int64 array
+        :param j: Row as a Python int or an int64 array
+        """
+        if isinstance(i, np.ndarray):
+            return i * 2 ** 32 + j
+        return (i * 2 ** 32 + j + 2 ** 63) % 2 ** 64 - 2 ** 63
+
+    def _cell(self, x, y):
+        """
+        :return: Column and row of the cell containing the point, clamped to one cell around `extent`
+        """
+        first_i, first_j, last_i, last_j = self.extent or (0, 0, 0, 0)
+        # Cells beyond the extent are all empty, so clamping before math.floor changes no answer
+        # and keeps infinite or far away coordinates from overflowing, and NaN from raising.
+        # Coordinates are first clipped like in `_cell_ranges`, to find figures clipped there.
+        limit = self.MAX_CELL_INDEX
+        return (
+            math.floor(min(last_i + 1, max(first_i - 1, min(limit, max(-limit, x / self.cell_size))))),
+            math.floor(min(last_j + 1, max(first_j - 1, min(limit, max(-limit, y / self.cell_size))))),
+        )
+
+    def _cell_ranges(self, bboxes):
+        """
+        :return: Arrays of the first column, first row, last column and last row of cells under `bboxes`,
+            clipped to `MAX_CELL_INDEX` so that they fit int64
+        """
+        cells = np.clip(np.floor(bboxes / self.cell_size), -self.MAX_CELL_INDEX, self.MAX_CELL_INDEX)
+        return cells.astype(np.int64)
+
+    def insert(self, numbers, bboxes):
+        """
+        Add figures to the grid.
+        :param numbers: Array of the numbers of the figures
+        :param bboxes: Array of 4 rows with their bounding boxes
+        """
+        if not len(numbers):
+            return
+        end = int(numbers.max()) + 1
+        if end > self.bboxes.size:
+            self.bboxes.reserve(end - self.bboxes.size)
+            self.bboxes.data[:, self.bboxes.size:end] = np.nan
+            self.bboxes.size = end
+        self.bboxes.data[:, numbers] = bboxes
+
+        first_i, first_j, last_i, last_j = self._cell_ranges(bboxes)
+        extent = (first_i.min(), first_j.min(), last_i.max(), last_j.max())
+        if self.extent is not None:
+            extent = (
+                min(extent[0], self.extent[0]), min(extent[1], self.extent[1]),
+                max(extent[2], self.extent[2]), max(extent[3], self.extent[3]),
+            )
+        self.extent = tuple(int(value) for value in extent)
+
+        # Sides are capped before multiplying, so the counts of huge figures cannot overflow.
+        widths = np.minimum(last_i - first_i + 1, self.MAX_CELLS_PER_FIGURE + 1)
+        counts = widths * np.minimum(last_j - first_j + 1, self.MAX_CELLS_PER_FIGURE + 1)
+        large = counts > self.MAX_CELLS_PER_FIGURE
+        self.large.update(numbers[large].tolist())
+        small = ~large
+        numbers, first_i, first_j, widths, counts = (
+            numbers[small], first_i[small], first_j[small], widths[small], counts[small])
+
+        # One (cell, figure) pair per cell of every figure, grouped by cell.
+        figures = np.repeat(np.arange(len(numbers)), counts)
+        offsets = np.arange(len(figures)) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = self._key(first_i[figures] + offsets % widths[figures], first_j[figures] + offsets // widths[figures])
+        order = np.argsort(keys, kind='stable')
+        keys, numbers = keys[order], numbers[figures[order]]
+        unique_keys, starts = np.unique(keys, return_index=True)
+        for key, cell_numbers in zip(unique_keys.tolist(), np.split(numbers, starts[1:])):
+            self.cells.setdefault(key, []).extend(cell_numbers.tolist())
+
+    def remove(self, number):
+        """
+        Remove a figure from the grid.
+        :param number: Number of the figure
+        """
+        if number in self.large:
+            self.large.discard(number)
+        else:
+            first_i, first_j, last_i, last_j = self._cell_ranges(self.bboxes.data[:, number]).tolist()
+            for i in range(first_i, last_i + 1):
+                for j in range(first_j, last_j + 1):
+                    key = self._key(i, j)
+                    cell = self.cells[key]
+                    cell.remove(number)
+                    if not cell:
+                        del self.cells[key]
+        self.bboxes.data[:, number] = np.nan
+
+    def _all_numbers(self):
+        return list(itertools.chain(self.large, *self.cells.values()))
+
+    def candidates_at(self, x, y):
+        """
+        :return: Array of the numbers of the figures whose bounding boxes contain the point
+        """
+        numbers = np.array([*self.large, *self.cells.get(self._key(*self._cell(x, y)), ())], dtype=np.int64)
+        bboxes = self.bboxes.data[:, numbers]
+        return numbers[(bboxes[0] <= x) & (bboxes[1] <= y) & (bboxes[2] >= x) & (bboxes[3] >= y)]
+
+    def candidates_in(self, min_x, min_y, max_x, max_y):
+        """
+        :return: Sorted array of the numbers of the figures whose bounding boxes overlap the box
+        """
+        first_i, first_j = self._cell(min_x, min_y)
+        last_i, last_j = self._cell(max_x, max_y)
+        if (last_i - first_i + 1) * (last_j - first_j + 1) > len(self.cells):
+            numbers = self._all_numbers()
+        else:
+            numbers = list(self.large)
+            for i in range(first_i, last_i + 1):
+                for j in range(first_j, last_j + 1):
+                    numbers.extend(self.cells.get(self._key(i, j), ()))
+        numbers = np.unique(np.array(numbers, dtype=np.int64))
+        bboxes = self.bboxes.data[:, numbers]
+        return numbers[(bboxes[0] <= max_x) & (bboxes[1] <= max_y) & (bboxes[2] >= min_x) & (bboxes[3] >= min_y)]
+
+    def rings(self, x, y):
+        """
+        Yield the figures around a point in growing square rings of cells.
+
+        Every step yields the numbers not yielded before, and the distance from
+        the point beyond which the figures not yielded yet lie.
+        """
+        seen = set()
+
+        def fresh(numbers):
+            numbers = [number for number in dict.fromkeys(numbers) if number not in seen]
+            seen.update(numbers)
+            return np.array(numbers, dtype=np.int64)
+
+        if self.extent is None:
+            yield fresh(self.large), math.inf
+            return
+        first_i, first_j, last_i, last_j = self.extent
+        center_i, center_j = self._cell(x, y)
+        numbers = list(self.large)
+        for radius in itertools.count():
+            if radius and 8 * radius > len(self.cells):
+                yield fresh(self._all_numbers()), math.inf
+                return
+            if radius == 0:
+                keys = [self._key(center_i, center_j)]
+            else:
+                keys = [self._key(i, j) for i in range(center_i - radius, center_i + radius + 1)
+                        for j in (center_j - radius, center_j + radius)]
+                keys += [self._key(i, j) for i in (center_i - radius, center_i + radius)
+                         for j in range(center_j - radius + 1, center_j + radius)]
+            for key in keys:
+                numbers.extend(self.cells.get(key, ()))
+            covered = (center_i - radius <= first_i and center_j - radius <= first_j
+                       and center_i + radius >= last_i and center_j + radius >= last_j)
+            # A point outside the grid lies outside the rings, where nothing bounds the distance yet.
+            reach = math.inf if covered else max(0.0, min(
+                x - (center_i - radius) * self.cell_size, (center_i + radius + 1) * self.cell_size - x,
+                y - (center_j - radius) * self.cell_size, (center_j + radius + 1) * self.cell_size - y,
+            ))
+            yield fresh(numbers), reach
+            if covered:
+                return
+            numbers = []
+
+
+class Scene:
+    """
+    A class representing a collection of shapes.
+
+    Figures are not kept as objects: every shape class gets its own store of
+    contiguous NumPy columns, one per constructor argument, so a figure costs
+    a few floats instead of an object and areas are computed per class in one
+    vectorized call. Figures are numbered in the order they are added and keep
+    their numbers when others are removed. A figure passed to `add_figure`
+    stays tied to the scene, so assigning one of its dimensions changes the
+    figure in the scene too, and indexing or iterating the scene returns that
+    object for as long as something else refers to it; otherwise a shape
+    object tied to the scene in the same way is created from the columns on
+    demand. Shape classes that do not declare their own `_fields` are kept as
+    objects.
+
+    The area of every figure is computed once, when it is added or changed,
+    and the total area is kept as a running sum, so `total_square` costs the
+    same for any number of figures.
+
+    Point, region and nearest figure queries go through a uniform grid over
+    the bounding boxes of the figures. It is built by the first query and
+    then kept up to date by every change to the scene.
+
+    Areas of figures added with `add_columns` or recomputed with
+    `recompute_total` are computed in shards by `workers` threads.
+    """
+
+    _REMOVED = np.iinfo(np.uint16).max
+
+    def __init__(self, cell_size=None, workers=1):
+        """
+        Initialize an empty scene.
+
+        :param cell_size: Side of a cell of the spatial index, or None to choose it from the figures
+        :param workers: Number of threads computing areas of many figures, 1 to compute them in the calling thread
+        """
+        self.workers = workers
+        self._stores = []
+        self._store_codes = {}
+        self._codes = _GrowableArray(None, dtype=np.uint16)
+        self._rows = _GrowableArray(None, dtype=np.int64)
+        self._areas = _GrowableArray(None, dtype=np.float64)
+        self._total = _CompensatedSum()
+        self._count = 0
+        self._cell_size = cell_size
+        self._index = None
+        self._indexed_count = 0
+        # Figures of column stores passed to add_figure, by number, while they are alive.
+        self._tied = weakref.WeakValueDictionary()
+
+    def _store_for(self, shape_type):
+        """
+        Return the code and store of a shape class, creating the store on first use.
+        :param shape_type: Exact class of the figures
+        :return: Tuple of store code and store
+        """
+        code = self._store_codes.get(shape_type)
+        if code is None:
+            columnar = '_fields' in shape_type.__dict__
+            self._stores.append(_ColumnStore(shape_type) if columnar else _ObjectStore(shape_type))
+            code = self._store_codes[shape_type] = len(self._stores) - 1
+        return code, self._stores[code]
+
+    def _locate(self, number):
+        """
+        Return where a figure is kept.
+        :param number: Number of the figure, negative to count from the last number given
+        :return: Tuple of the non-negative number, the store code and the row in the store
+        :raise IndexError: If there is no such figure or it was removed
+        """
+        size = self._codes.size
+        if not -size <= number < size:
+            raise IndexError('Scene index out of range.')
+        number %= size
+        code = int(self._codes.data[number])
+        if code == self._REMOVED:
+            raise IndexError(f'Figure {number} was removed from the scene.')
+        return number, code, int(self._rows.data[number])
 
     def add_figure(self, figure):
         """
-        Add a figure to the scene.
+        Add a figure to the scene and tie it to the scene, so assigning its dimensions changes the scene.
 
         :param figure: A shape to add to the scene
+        :return: Number of the figure in the scene
+        :raise ValueError: If the figure already belongs to a scene
+        """
+        if figure._owner is not None:
+            raise ValueError('The figure already belongs to a scene.')
+        code, store = self._store_for(type(figure))
+        number = self._codes.size
+        figure._owner = (self, number)
+        if isinstance(store, _ColumnStore):
+            self._tied[number] = figure
+        area = figure.square()
+        self._rows.append(store.append(figure, number))
+        self._areas.append(area)
+        self._total.add(area)
+        self._count += 1
+        self._codes.append(code)
+        if self._index is not None:
+            self._index.insert(np.array([number]), np.array(figure.bbox()).reshape(4, 1))
+        return number
+
+    def add_columns(self, shape_type, **columns):
+        """
+        Add many figures of one class at once, given as arrays of their constructor arguments.
+
+        :param shape_type: Shape class of the figures, which must declare `_fields`
+        :param columns: One array per name in `shape_type._fields`, all of the same length
+        :return: Range of the numbers of the new figures
+        :raise ValueError: If a column is missing or has another length, or a figure is invalid
+        """
+        if '_fields' not in shape_type.__dict__:
+            raise ValueError(f'{shape_type.__name__} has no columns, add its figures one by one.')
+        if set(columns) != set(shape_type._fields):
+            raise ValueError(f'{shape_type.__name__} needs the columns {", ".join(shape_type._fields)}.')
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        integral = sum(
+            1 << position for position, name in enumerate(shape_type._fields)
+            if np.issubdtype(columns[name].dtype, np.integer)
+        )
+        columns = {name: values.astype(np.float64).ravel() for name, values in columns.items()}
+        count = len(columns['x'])
+        if any(len(values) != count for values in columns.values()):
+            raise ValueError('All columns must have the same length.')
+        shape_type._validate_columns(columns)
+
+        code, store = self._store_for(shape_type)
+        first = self._codes.size
+        self._areas.reserve(count)
+        total = _sharded_squares(shape_type, columns, self._areas.data[first:first + count], self.workers)
+        self._areas.size += count
+        first_row = store.extend(columns, np.arange(first, first + count), integral)
+        self._rows.extend(np.arange(first_row, first_row + count))
+        self._total.add(total)
+        self._count += count
+        self._codes.extend(np.full(count, code, dtype=np.uint16))
+        if self._index is not None:
+            self._index.insert(np.arange(first, first + count), shape_type._bboxes(columns))
+        return range(first, first + count)
+
+    def update_figure(self, number, **changes):
+        """
+        Change dimensions of a figure, checking them like its constructor does.
+
+        This is what assigning a dimension of `scene[number]` calls.
+
+        :param number: Number of the figure
+        :param changes: New values of the figure's dimensions, by name
+        :raise IndexError: If there is no such figure
+        :raise ValueError: If the figure has no such dimension or would be invalid
         """
-        self._figures.append(figure)
+        number, code, row = self._locate(number)
+        store = self._stores[code]
+        area = store.update(row, changes)
+        figure = self._tied.get(number)
+        if figure is not None:
+            figure._owner = None
+            try:
+                for name, value in changes.items():
+                    setattr(figure, name, value)
+            finally:
+                figure._owner = (self, number)
+        self._total.add(-float(self._areas.data[number]))
+        self._total.add(area)
+        self._areas.data[number] = area
+        if self._index is not None:
+            self._index.remove(number)
+            self._index.insert(np.array([number]), store.call('_bboxes', np.array([row])))
+
+    def remove_figure(self, number):
+        """
+        Remove a figure from the scene. The numbers of the other figures do not change.
+
+        :param number: Number of the figure
+        :return: The removed figure, no longer tied to the scene
+        :raise IndexError: If there is no such figure
+        """
+        number, code, row = self._locate(number)
+        store = self._stores[code]
+        figure = self._tied.pop(number, None)
+        if figure is None:
+            figure = store.get(row)
+        figure._owner = None
+        moved = store.remove(row)
+        if moved is not None:
+            self._rows.data[moved] = row
+        if self._index is not None:
+            self._index.remove(number)
+        self._codes.data[number] = self._REMOVED
+        self._count -= 1
+        if self._count:
+            self._total.add(-float(self._areas.data[number]))
+        else:
+            self._total = _CompensatedSum()
+        return figure
+
+    def _spatial_index(self):
+        """
+        Return the spatial index, building it if there is none or, with an automatic cell size,
+        if the scene has grown four times since it was built.
+        :return: _GridIndex, or None if the scene is empty
+        """
+        if self._index is not None and (self._cell_size is not None or self._count <= 4 * self._indexed_count):
+            return self._index
+        if not self._count:
+            return None
+        bboxes = np.full((4, self._codes.size), np.nan)
+        for store in self._stores:
+            if len(store):
+                bboxes[:, store.all_numbers()] = store.call('_bboxes', np.arange(len(store)))
+        numbers = np.flatnonzero(self._codes.view() != self._REMOVED)
+        bboxes = bboxes[:, numbers]
+        cell_size = self._cell_size or self._choose_cell_size(bboxes)
+        self._index = _GridIndex(cell_size)
+        self._index.insert(numbers, bboxes)
+        self._indexed_count = self._count
+        return self._index
+
+    @staticmethod
+    def _choose_cell_size(bboxes):
+        """
+        Return a cell size of twice the typical figure size, or larger if the figures are spread out
+        enough for that to leave about one figure per cell.
+        :param bboxes: Array of 4 rows with the bounding boxes of the figures
+        :return: Cell size
+        """
+        sizes = np.maximum(bboxes[2] - bboxes[0], bboxes[3] - bboxes[1])
+        extent_area = (bboxes[2].max() - bboxes[0].min()) * (bboxes[3].max() - bboxes[1].min())
+        cell_size = max(2 * float(np.median(sizes)), math.sqrt(extent_area / bboxes.shape[1]))
+        return cell_size if cell_size > 0 and math.isfinite(cell_size) else 1.0
+
+    def _evaluate(self, numbers, method, x, y):
+        """
+        Call a classmethod such as `_contains` on the figures `numbers`, one call per store.
+        :param numbers: Array of numbers of figures in the scene
+        :param method: Name of the classmethod
+        :param x: X-coordinate of the point
+        :param y: Y-coordinate of the point
+        :return: Array of results in the order of `numbers`
+        """
+        codes = self._codes.data[numbers]
+        rows = self._rows.data[numbers]
+        results = None
+        for code in np.unique(codes).tolist():
+            selected = codes == code
+            values = self._stores[code].call(method, rows[selected], x, y)
+            if results is None:
+                results = np.empty(len(numbers), dtype=values.dtype)
+            results[selected] = values
+        return results if results is not None else np.empty(0)
+
+    @staticmethod
+    def _coordinates(point):
+        return (point.x, point.y) if isinstance(point, Shape) else tuple(point)
+
+    def figures_at(self, point):
+        """
+        Return the figures that contain a point, their boundaries included.
+
+        :param point: Point object or pair of coordinates
+        :return: Sorted list of the numbers of the figures
+        """
+        x, y = self._coordinates(point)
+        index = self._spatial_index()
+        if index is None:
+            return []
+        numbers = np.sort(index.candidates_at(x, y))
+        if not len(numbers):
+            return []
+        return numbers[self._evaluate(numbers, '_contains', x, y)].tolist()
+
+    def figures_in(self, bbox):
+        """
+        Return the figures whose bounding boxes overlap a box, touching included.
+
+        :param bbox: Tuple of min x, min y, max x and max y
+        :return: Sorted list of the numbers of the figures
+        :raise ValueError: If the box has a min greater than its max
+        """
+        min_x, min_y, max_x, max_y = bbox
+        if min_x > max_x or min_y > max_y:
+            raise ValueError('The box must be given as min x, min y, max x, max y.')
+        index = self._spatial_index()
+        if index is None:
+            return []
+        return index.candidates_in(min_x, min_y, max_x, max_y).tolist()
+
+    def nearest(self, point, count=1):
+        """
+        Return the figures closest to a point, measuring to their boundaries, and 0 for figures containing it.
+
+        :param point: Point object or pair of coordinates
+        :param count: Number of figures to return
+        :return: List of pairs of figure number and distance, closest first
+        """
+        x, y = self._coordinates(point)
+        index = self._spatial_index()
+        if index is None or count <= 0:
+            return []
+        distances = {}
+        for numbers, reach in index.rings(x, y):
+            if len(numbers):
+                distances.update(zip(numbers.tolist(), self._evaluate(numbers, '_distances', x, y).tolist()))
+            if len(distances) >= count and heapq.nsmallest(count, distances.values())[-1] <= reach:
+                break
+        return heapq.nsmallest(count, distances.items(), key=lambda item: (item[1], item[0]))
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, number):
+        """
+        Return a figure by the number `add_figure` gave it, as a shape object tied to the scene.
+
+        :param number: Number of the figure
+        :return: Shape object
+        :raise IndexError: If there is no such figure
+        """
+        return self._figure(*self._locate(number))
+
+    def _figure(self, number, code, row):
+        """
+        Return the object passed to `add_figure` for a figure if it is alive, or a new one tied to the scene.
+        :param number: Number of the figure
+        :param code: Code of its store
+        :param row: Row of the figure in the store
+        :return: Shape object
+        """
+        figure = self._tied.get(number)
+        return figure if figure is not None else self._stores[code].get(row, (self, number))
+
+    def items(self):
+        """
+        Iterate over the numbers and figures in the order they were added, creating each object on demand
+        unless the one passed to `add_figure` is still alive.
+        """
+        codes = self._codes.view()
+        numbers = np.flatnonzero(codes != self._REMOVED)
+        for number, code, row in zip(numbers.tolist(), codes[numbers].tolist(), self._rows.data[numbers].tolist()):
+            yield number, self._figure(number, code, row)
+
+    def __iter__(self):
+        """
+        Iterate over the figures in the order they were added, creating each object on demand.
+        """
+        for _, figure in self.items():
+            yield figure
 
     def total_square(self):
         """
-        Calculate and return the total area of all figures in the scene.
+        Return the total area of all figures in the scene.
+        :return: Total area of the figures
+        """
+        return self._total.value()
+
+    def recompute_total(self):
+        """
+        Compute the area of every figure again from its dimensions and restart the running total from them.
+
+        The running total of `total_square` only adds and subtracts areas, so
+        after very many changes it may differ from the sum of the areas in the
+        last bits; this removes that difference.
+
         :return: Total area of the figures
         """
-        return sum(f.square() for f in self._figures)
+        partial_totals = []
+        for store in self._stores:
+            if not len(store):
+                continue
+            if isinstance(store, _ColumnStore):
+                areas = np.empty(len(store))
+                partial_totals.append(_sharded_squares(store.shape_type, store.columns(), areas, self.workers))
+            else:
+                areas = store.squares()
+                partial_totals.append(math.fsum(areas))
+            self._areas.data[store.all_numbers()] = areas
+        self._total = _CompensatedSum()
+        self._total.add(math.fsum(partial_totals))
+        return self._total.value()
 
     def __str__(self):
         """
         Return a string representation of all the figures in the scene.
         :return: String listing all figures in the scene
         """
-        return "\n".join([str(f) for f in self._figures])
+        return "\n".join([str(f) for f in self])
 
 
-scene = Scene()
-scene.add_figure(Rectangle(0, 0, 10, 20))
-scene.add_figure(Circle(10, 0, 10))
-scene.add_figure(Parallelogram(1, 2, 18, 23, 38))
-scene.add_figure(Triangle(20, 5, 10, 20, 27))
+if __name__ == '__main__':
+    scene = Scene()
+    scene.add_figure(Rectangle(0, 0, 10, 20))
+    scene.add_figure(Circle(10, 0, 10))
+    scene.add_figure(Parallelogram(1, 2, 18, 23, 38))
+    scene.add_figure(Triangle(20, 5, 10, 20, 27))
 
-print(f"Scene's total square: {scene.total_square()}")
+    print(f"Scene's total square: {scene.total_square()}")
@@ -0,0 +1,45 @@
+"""
+Regression tests for the spatial index of Scene with coordinates far from the origin.
+
+Run from this directory with `python -m pytest test_spatial_index.py`.
+"""
+import math
+
+from main import Circle, Rectangle, Scene
+
+
+def far_scene():
+    scene = Scene(cell_size=1.0)
+    scene.add_figure(Circle(1e10, 5, 1))
+    scene.add_figure(Circle(10, 5, 1))
+    scene.add_figure(Circle(-3e12, -7e11, 2))
+    scene.add_figure(Circle(1e25, 1e25, 1e7))
+    return scene
+
+
+def test_figures_beyond_32_bit_cells_are_found():
+    scene = far_scene()
+    assert scene.figures_at((1e10, 5)) == [0]
+    assert scene.figures_at((10, 5)) == [1]
+    assert scene.figures_at((-3e12, -7e11)) == [2]
+    assert scene.figures_at((1e25, 1e25)) == [3]
+    assert scene.figures_in((1e10 - 1, 4, 1e10 + 1, 6)) == [0]
+    assert scene.nearest((1e10, 7)) == [(0, 1.0)]
+
+
+def test_figures_beyond_32_bit_cells_can_be_removed():
+    scene = far_scene()
+    for number in (0, 2, 3):
+        scene.remove_figure(number)
+    assert len(scene) == 1
+    assert scene.figures_at((1e10, 5)) == []
+    assert scene.figures_at((10, 5)) == [1]
+
+
+def test_infinite_and_huge_boxes():
+    scene = far_scene()
+    scene.add_figure(Rectangle(-1e20, -1e20, 2e20, 2e20))
+    assert scene.figures_in((-math.inf, -math.inf, math.inf, math.inf)) == [0, 1, 2, 3, 4]
+    assert scene.figures_at((math.inf, 0)) == []
+    assert scene.figures_at((math.nan, 0)) == []
+    assert scene.figures_at((1e10, 5)) == [0, 4]
@@ -0,0 +1,104 @@
+"""
+Load-test the serving modes of the Flask apps against a slow local upstream.
+
+Every scenario serves a small Flask app whose views call the upstream through
+`http_client`, then sends requests at several concurrency levels and prints
+throughput and latency percentiles. With `--url`, an app that is already
+running, for example under gunicorn, is measured the same way instead.
+
+Run from the repository root with `python load_test.py`.
+"""
+import argparse
+import logging
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+import httpx
+from flask import Flask, request
+from werkzeug.serving import make_server
+
+import http_client
+from local_server import LocalServer
+
+
+CONCURRENCY_LEVELS = (1, 8, 32)
+REQUESTS_PER_LEVEL = 64
+UPSTREAM_DELAY = 0.05
+FANOUT = 2
+
+load_client = http_client.HttpClient(
+    limits=httpx.Limits(max_connections=None, max_keepalive_connections=None), retries=0
+)
+
+
+def create_app(upstream_url):
+    """Return an app whose view calls the upstream `fanout` times."""
+    app = Flask(__name__)
+
+    @app.route('/sync')
+    def sync_view():
+        fanout = request.args.get('fanout', 1, type=int)
+        return {'statuses': [http_client.get(upstream_url).status_code for _ in range(fanout)]}
+
+    return app
+
+
+@contextmanager
+def serve(app, threaded):
+    """Serve `app` with the Werkzeug server used by `app.run`, and yield its URL."""
+    server = make_server('127.0.0.1', 0, app, threaded=threaded)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+
+
+def measure(url, concurrency, total=REQUESTS_PER_LEVEL):
+    """Send `total` GET requests to `url`, `concurrency` at a time, and return throughput and latencies."""
+    start = time.perf_counter()
+    responses = load_client.fetch_many([url] * total, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    failures = [response for response in responses if isinstance(response, Exception) or response.is_error]
+    latencies = sorted(response.elapsed.total_seconds() for response in responses if not isinstance(response, Exception))
+    return {
+        'requests_per_second': total / elapsed,
+        'p50': statistics.median(latencies) if latencies else float('nan'),
+        'p95': latencies[int(len(latencies) * 0.95) - 1] if latencies else float('nan'),
+        'failures': len(failures),
+    }
+
+
+def report(name, url, levels):
+    for concurrency in levels:
+        result = measure(url, concurrency)
+        print(
+            f'{name:<32} c={concurrency:<3} {result["requests_per_second"]:>8.1f} req/s'
+            f'  p50 {result["p50"] * 1000:>7.1f} ms  p95 {result["p95"] * 1000:>7.1f} ms'
+            f'  failures {result["failures"]}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='measure this running endpoint instead of the built-in scenarios')
+    parser.add_argument('--fanout', type=int, default=FANOUT, help='upstream calls per request in the built-in app')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=CONCURRENCY_LEVELS)
+    arguments = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    if arguments.url:
+        report(arguments.url, arguments.url, arguments.concurrency)
+    else:
+        scenarios = (
+            ('sync view, single thread', '/sync', False),
+            ('sync view, threaded', '/sync', True),
+        )
+        with LocalServer(b'{"status": "ok"}', delay=UPSTREAM_DELAY, content_type='application/json') as upstream:
+            app = create_app(upstream.url)
+            for name, path, threaded in scenarios:
+                with serve(app, threaded) as base_url:
+                    report(name, f'{base_url}{path}?fanout={arguments.fanout}', arguments.concurrency)
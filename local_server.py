@@ -0,0 +1,89 @@
+"""
+A local HTTP stand-in for upstream sites and APIs, for the demos and benchmarks of the homework apps.
+"""
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.count_lock:
+            self.server.requests_served += 1
+        time.sleep(self.server.delay)
+        if not self.server.available:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        body = self.server.body
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', self.server.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandInServer(ThreadingHTTPServer):
+    # Room for the connections of a load test arriving at once, beyond the default backlog of 5.
+    request_queue_size = 256
+
+
+class LocalServer:
+    """
+    A local HTTP stand-in for upstream sites, served from a background thread.
+
+    Every GET request answers `body` after `delay` seconds, or 500 while
+    `available` is False, and is counted in `requests_served`, so callers can
+    check how many requests reached the upstream. `body` and `available` can
+    be changed while the server runs.
+
+    Usage:
+        with LocalServer(delay=0.05) as server:
+            fetch_url(server.url)
+    """
+
+    def __init__(self, body=b'stand-in response', delay=0.0, content_type='text/plain'):
+        self._server = _StandInServer(('127.0.0.1', 0), _StandInHandler)
+        self._server.body = body
+        self._server.delay = delay
+        self._server.content_type = content_type
+        self._server.available = True
+        self._server.requests_served = 0
+        self._server.count_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/'
+
+    @property
+    def body(self):
+        return self._server.body
+
+    @body.setter
+    def body(self, body):
+        self._server.body = body
+
+    @property
+    def available(self):
+        return self._server.available
+
+    @available.setter
+    def available(self, available):
+        self._server.available = available
+
+    @property
+    def requests_served(self):
+        return self._server.requests_served
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
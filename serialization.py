@@ -0,0 +1,124 @@
+"""
+Shared JSON serialization for the homework apps.
+
+Responses are encoded with orjson when it is installed and with the standard
+library otherwise. Both decode to the same values, but the bytes can differ in
+how floats are written, e.g. 1e16 from orjson and 1e+16 from the standard
+library. NaN and infinities, which are not valid JSON, are sent as null by
+both. Install it on an app with `install(app)` so that `jsonify` and dict
+return values use it.
+"""
+import json
+import math
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+STREAM_CHUNK_SIZE = 1000
+
+_default = DefaultJSONProvider.default
+
+if ORJSON_AVAILABLE:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj, sort_keys=False):
+        """Return `obj` encoded as compact JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+    _sorted_encoder = json.JSONEncoder(
+        default=_default, separators=(',', ':'), ensure_ascii=False, allow_nan=False, sort_keys=True
+    )
+
+    def dumps(obj, sort_keys=False):
+        """Return `obj` encoded as compact JSON bytes, with NaN and infinities as null like orjson."""
+        encoder = _sorted_encoder if sort_keys else _encoder
+        try:
+            text = encoder.encode(obj)
+        except ValueError as e:
+            if 'Out of range float' not in str(e):
+                raise
+            text = encoder.encode(_finite(obj))
+        return text.encode()
+
+
+def _finite(obj):
+    """Return `obj` with NaN and infinite floats in nested dicts, lists and tuples replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def iter_json_array(items, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield the JSON array of `items` in pieces of `chunk_size` items.
+
+    Items are encoded as they are read from `items`, so a response built on
+    this needs memory for one piece however long the array is.
+    """
+    yield b'['
+    chunk = []
+    separator = b''
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield separator + dumps(chunk)[1:-1]
+            separator = b','
+            chunk = []
+    if chunk:
+        yield separator + dumps(chunk)[1:-1]
+    yield b']'
+
+
+def iter_json_lines(items, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield `items` as newline-delimited JSON, `chunk_size` lines per piece."""
+    chunk = []
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == chunk_size:
+            yield b'\n'.join(chunk) + b'\n'
+            chunk = []
+    if chunk:
+        yield b'\n'.join(chunk) + b'\n'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    A Flask JSON provider that encodes compact responses with `dumps`.
+
+    Output decodes to the same values as the default provider, including
+    sorted keys and the encoding of dates, decimals and dataclasses, except
+    that NaN and infinities are sent as null instead of invalid JSON, and
+    non-ASCII text is sent as UTF-8 instead of escapes. Indented debug output
+    and calls with extra options still go through the default provider.
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(dumps(obj, sort_keys=self.sort_keys) + b'\n', mimetype=self.mimetype)
+
+
+def install(app):
+    """Make `app` encode its JSON responses with `dumps`."""
+    app.json = FastJSONProvider(app)
+    return app